@@ -18,27 +18,49 @@ Send updates:
     await writer.post("https://example.com/feed.xml")
 """
 
-from .client import HIVE_NODES
+from .checkpoint import CheckpointStore, FileCheckpointStore, SQLiteCheckpointStore
+from .client import (
+    HIVE_NODES,
+    close_shared_connector,
+    create_connector,
+    shared_connector,
+)
+from .confirm import BlockFollower
 from .errors import (
     PodpingAuthenticationError,
+    PodpingBatchError,
     PodpingConnectionError,
     PodpingError,
     PodpingNetworkError,
     PodpingValidationError,
 )
+from .ratelimit import RateLimiter
 from .types import PodpingData
+from .urlset import UrlSet, normalize_url
 from .watcher import PodpingWatcher
-from .writer import PodpingWriter
+from .writer import PodpingWriter, PodpingWriterPool
 
 __version__ = "1.0.0"
 __all__ = [
     "PodpingWatcher",
     "PodpingWriter",
+    "PodpingWriterPool",
+    "RateLimiter",
+    "BlockFollower",
     "PodpingData",
+    "CheckpointStore",
+    "FileCheckpointStore",
+    "SQLiteCheckpointStore",
+    "UrlSet",
+    "normalize_url",
     "PodpingError",
     "PodpingConnectionError",
     "PodpingAuthenticationError",
     "PodpingValidationError",
     "PodpingNetworkError",
+    "PodpingBatchError",
     "HIVE_NODES",
+    "create_connector",
+    "shared_connector",
+    "close_shared_connector",
 ]
@@ -0,0 +1,93 @@
+"""Checkpoint stores for resuming a watcher from the last processed block."""
+
+import os
+import sqlite3
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class CheckpointStore(ABC):
+    """Base class for persisting the last fully processed block number.
+
+    The watcher never closes its store, so it can be started again. Close it
+    when done, or use it as a context manager.
+    """
+
+    @abstractmethod
+    def load(self) -> Optional[int]:
+        """Return the last saved block number, or ``None`` if nothing was saved."""
+
+    @abstractmethod
+    def save(self, block_num: int) -> None:
+        """Persist ``block_num`` as the last fully processed block."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "CheckpointStore":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+
+class FileCheckpointStore(CheckpointStore):
+    """Store the checkpoint in a text file, replaced atomically on every save."""
+
+    def __init__(self, path: str) -> None:
+        self.path = os.fspath(path)
+
+    def load(self) -> Optional[int]:
+        try:
+            with open(self.path) as f:
+                return int(f.read().strip())
+        except FileNotFoundError:
+            return None
+
+    def save(self, block_num: int) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".checkpoint-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(f"{block_num}\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Store checkpoints in a SQLite database, one row per ``name``."""
+
+    def __init__(self, path: str, name: str = "default") -> None:
+        self.name = name
+        self._conn = sqlite3.connect(os.fspath(path))
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "name TEXT PRIMARY KEY, block_num INTEGER NOT NULL, updated_at REAL)"
+            )
+
+    def load(self) -> Optional[int]:
+        row = self._conn.execute(
+            "SELECT block_num FROM checkpoints WHERE name = ?", (self.name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def save(self, block_num: int) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (name, block_num, updated_at) "
+                "VALUES (?, ?, ?)",
+                (self.name, block_num, time.time()),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
@@ -1,19 +1,59 @@
 """Hive blockchain client for PodPing operations."""
 
 import asyncio
+import itertools
 import logging
-from typing import List, Optional
+import ssl
+import struct
+import time
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import aiohttp
-from lighthive.client import Client
 from lighthive.datastructures import Operation
 from lighthive.exceptions import RPCNodeException
-from lighthive.helpers.account import Account
 
-from .errors import PodpingConnectionError, PodpingNetworkError
+from .errors import PodpingConnectionError, PodpingNetworkError, PodpingValidationError
+from .nodes import NodePool
+from .rc import RCEstimator
+from .scheduler import BLOCK_INTERVAL
+from .transaction import (
+    HIVE_CHAIN_ID,
+    HIVE_CUSTOM_OP_BLOCK_LIMIT,
+    HIVE_MAX_TRANSACTION_SIZE,
+    SIGNATURE_SIZE,
+    decode_private_key,
+    serialize_transaction,
+    sign_transaction,
+    transaction_id,
+)
 
 logger = logging.getLogger(__name__)
 
+# How long to wait before asking again for a block at the head that a node
+# hasn't applied yet
+NEAR_HEAD_RETRY_DELAY = 0.5
+
+# Maximum number of blocks hived returns from block_api.get_block_range
+BLOCK_RANGE_LIMIT = 1000
+
+# Latency-sensitive calls worth hedging; ``None`` hedges after the node's p90 latency
+HEDGED_METHODS: Dict[str, Optional[float]] = {
+    "condenser_api.get_block": None,
+    "condenser_api.get_dynamic_global_properties": None,
+}
+
 HIVE_NODES = [
     "https://api.hive.blog",
     "https://api.openhive.network",
@@ -32,7 +72,7 @@ HIVE_NODES = [
 ]
 
 
-def _format_rpc_error(error) -> str:
+def _format_rpc_error(error: Any) -> str:
     """Build a readable message from an RPC error (dict or RPCNodeException)."""
     if isinstance(error, RPCNodeException):
         msg = str(error)
@@ -56,87 +96,678 @@ def _format_rpc_error(error) -> str:
     return msg
 
 
+def _is_duplicate_transaction(data: Any) -> bool:
+    """Whether a broadcast was rejected because the node already has the transaction."""
+    if not isinstance(data, dict) or "error" not in data:
+        return False
+    return "duplicate transaction" in _format_rpc_error(data["error"]).lower()
+
+
+# One shared connector per event loop, so every client reuses the same
+# keep-alive connections
+_shared_connectors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.TCPConnector]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def create_connector(
+    limit: int = 100,
+    limit_per_host: int = 8,
+    keepalive_timeout: float = 60.0,
+    ttl_dns_cache: int = 300,
+    ssl_context: Optional[ssl.SSLContext] = None,
+) -> aiohttp.TCPConnector:
+    """Create a connection pool for :class:`HiveClient`.
+
+    Connections are kept alive for ``keepalive_timeout`` seconds and reused by
+    every client sharing the connector. DNS results are cached for
+    ``ttl_dns_cache`` seconds. Pass an ``ssl_context`` to share certificate
+    loading and TLS settings across connectors.
+    """
+    kwargs: Dict[str, Any] = {}
+    if ssl_context is not None:
+        # Left to aiohttp's default otherwise: on 3.8, ``ssl=True`` disables
+        # certificate verification
+        kwargs["ssl"] = ssl_context
+    return aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=ttl_dns_cache,
+        use_dns_cache=True,
+        **kwargs,
+    )
+
+
+def shared_connector() -> aiohttp.TCPConnector:
+    """Return the connector shared by all clients on the running event loop."""
+    loop = asyncio.get_running_loop()
+    connector = _shared_connectors.get(loop)
+    if connector is None or connector.closed:
+        connector = _shared_connectors[loop] = create_connector()
+    return connector
+
+
+async def close_shared_connector() -> None:
+    """Close the shared connector for the running event loop, e.g. at shutdown."""
+    connector = _shared_connectors.pop(asyncio.get_running_loop(), None)
+    if connector is not None:
+        await connector.close()
+
+
+# Node health is shared by every client using the same nodes, so one set of
+# probes and head checks serves all of them
+_shared_pools: "weakref.WeakValueDictionary[Tuple[Tuple[str, ...], int], NodePool]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+class _Prober:
+    """The background probes of a shared pool, run by one of its open clients."""
+
+    def __init__(self) -> None:
+        self.clients: List["HiveClient"] = []
+        self.owner: Optional["HiveClient"] = None
+        self.task: Optional[asyncio.Task] = None
+        # Open clients that follow the chain and want node heads compared
+        self.head_checkers = 0
+        self.last_head_check: Optional[float] = None
+
+    def head_check_due(self, interval: float) -> bool:
+        return self.head_checkers > 0 and (
+            self.last_head_check is None
+            or time.monotonic() - self.last_head_check >= interval
+        )
+
+
+_probers: "weakref.WeakKeyDictionary[NodePool, _Prober]" = weakref.WeakKeyDictionary()
+
+
+def _shared_pool(nodes: List[str], max_lag: int) -> NodePool:
+    key = (tuple(nodes), max_lag)
+    pool = _shared_pools.get(key)
+    if pool is None:
+        pool = _shared_pools[key] = NodePool(nodes, max_lag=max_lag)
+    return pool
+
+
+def _normalize_block(block: dict) -> dict:
+    """Convert a block_api block to the condenser_api shape (``[type, value]`` ops)."""
+    transactions = []
+    for tx in block.get("transactions", []):
+        operations = []
+        for op in tx.get("operations", []):
+            if isinstance(op, dict):
+                op_type = op.get("type", "")
+                if op_type.endswith("_operation"):
+                    op_type = op_type[: -len("_operation")]
+                op = [op_type, op.get("value", {})]
+            operations.append(op)
+        transactions.append({**tx, "operations": operations})
+    return {**block, "transactions": transactions}
+
+
 class HiveClient:
-    """Async Hive JSON-RPC client with automatic node failover."""
+    """Async Hive JSON-RPC client with automatic node failover.
 
-    def __init__(self, nodes: Optional[List[str]] = None):
-        self.nodes = nodes or HIVE_NODES.copy()
+    ``hedge`` maps method names to a delay in seconds (or ``None`` for the node's
+    p90 latency). If the first node hasn't answered by then, the same request is
+    sent to the next best node and the first response wins. ``hedge_budget``
+    caps the extra requests as a fraction of hedgeable calls.
+
+    With ``head_checks``, for clients that follow the chain, the head block of
+    every node is compared on opening and every ``head_check_interval`` seconds
+    after, and nodes more than ``max_lag`` blocks behind are taken out of
+    rotation until they catch up. Clients with the same ``nodes`` share node
+    health, and one of the open ones runs the probes and head checks for all.
+
+    Clients use the process-wide :func:`shared_connector` unless given a
+    ``connector``, so short-lived clients reuse warm keep-alive connections.
+    """
+
+    def __init__(
+        self,
+        nodes: Optional[List[str]] = None,
+        probe_interval: float = 5.0,
+        hedge: Optional[Dict[str, Optional[float]]] = None,
+        hedge_budget: float = 0.1,
+        max_lag: int = 10,
+        head_check_interval: float = 30.0,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        head_checks: bool = False,
+    ):
+        # The pool tracks nodes by URL, so each is tried once per request
+        self.nodes = list(dict.fromkeys(nodes or HIVE_NODES))
+        self.connector = connector
+        self.pool = _shared_pool(self.nodes, max_lag)
+        self.probe_interval = probe_interval
+        self.head_check_interval = head_check_interval
+        self.head_checks = head_checks
+        self.hedge = hedge or {}
+        self.hedge_budget = hedge_budget
+        self._hedge_tokens = 1.0
         self._session: Optional[aiohttp.ClientSession] = None
-        self._node_idx = 0
+        self._request_ids = itertools.count(1)
 
-    async def __aenter__(self):
+    async def __aenter__(self) -> "HiveClient":
         self._session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30.0, connect=10.0)
+            connector=self.connector or shared_connector(),
+            connector_owner=False,
+            timeout=aiohttp.ClientTimeout(total=30.0, connect=10.0),
         )
+        prober = _probers.setdefault(self.pool, _Prober())
+        prober.clients.append(self)
+        if self.head_checks:
+            prober.head_checkers += 1
+        if prober.task is None or prober.task.done():
+            self._run_probes(prober)
+        elif prober.head_check_due(self.head_check_interval):
+            # Check heads now rather than at the running loop's next pass
+            prober.task.cancel()
+            self._run_probes(prober)
         return self
 
-    async def __aexit__(self, *_):
+    async def __aexit__(self, *_: object) -> None:
+        prober = _probers.get(self.pool)
+        if prober is not None and self in prober.clients:
+            prober.clients.remove(self)
+            if self.head_checks:
+                prober.head_checkers -= 1
+            if prober.owner is self:
+                if prober.task:
+                    prober.task.cancel()
+                prober.owner = prober.task = None
+                if prober.clients:
+                    # Hand the probes over to a client that is still open
+                    prober.clients[0]._run_probes(prober)
         if self._session:
             await self._session.close()
 
-    def _next_node(self):
-        self._node_idx = (self._node_idx + 1) % len(self.nodes)
+    def _run_probes(self, prober: _Prober) -> None:
+        prober.owner = self
+        prober.task = asyncio.ensure_future(self._probe_loop(prober))
+
+    async def _post(self, node: str, payload: Any) -> Any:
+        """POST ``payload`` to one node, recording its latency and head block."""
+        if not self._session:
+            raise PodpingConnectionError("Use 'async with HiveClient() as client:'.")
+
+        started = time.monotonic()
+        async with self._session.post(node, json=payload) as resp:
+            data = await resp.json()
+
+        head_block = None
+        if (
+            isinstance(data, dict)
+            and isinstance(data.get("result"), dict)
+            and payload.get("method") == "condenser_api.get_dynamic_global_properties"
+        ):
+            head_block = data["result"].get("head_block_number")
+        self.pool.record_success(node, time.monotonic() - started, head_block)
+        return data
+
+    async def _send(
+        self, payload: Any, accept: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """POST a JSON-RPC payload to the best node, failing over on network errors.
 
-    async def rpc_call(self, method: str, params: list = None) -> dict:
+        If ``accept`` is given and rejects a response, the node is treated as
+        lagging and the next node is tried. The last response is returned if no
+        node gives an acceptable one.
+        """
+        return (await self._send_via(payload, accept))[1]
+
+    async def _send_via(
+        self,
+        payload: Any,
+        accept: Optional[Callable[[Any], bool]] = None,
+        avoid: Iterable[str] = (),
+        applied: Optional[Callable[[Any], bool]] = None,
+    ) -> Tuple[str, Any]:
+        """Like :meth:`_send`, trying nodes in ``avoid`` last. Returns ``(node, data)``.
+
+        A node may apply a request and still fail before answering. If
+        ``applied`` matches a response after such a failure, the payload is
+        taken to have gone through already and the response is returned.
+        """
         if not self._session:
             raise PodpingConnectionError("Use 'async with HiveClient() as client:'.")
 
-        payload = {"jsonrpc": "2.0", "method": method, "params": params or [], "id": 1}
         last_error = None
+        data = None
+        node = None
+        tried: List[str] = []
+        avoid = list(avoid)
 
         for _ in range(len(self.nodes)):
-            node = self.nodes[self._node_idx]
+            node = self.pool.best(exclude=tried + avoid) or self.pool.best(exclude=tried)
+            if node is None:
+                break
+            tried.append(node)
             try:
-                async with self._session.post(node, json=payload) as resp:
-                    data = await resp.json()
-                    if "error" in data:
-                        self._next_node()
-                        raise PodpingNetworkError(_format_rpc_error(data["error"]))
-                    return data["result"]
+                data = await self._post(node, payload)
             except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
                 last_error = e
                 logger.debug(f"Node {node} failed: {e}")
-                self._next_node()
-                await asyncio.sleep(0.1)
+                self.pool.record_failure(node)
+                continue
+
+            if last_error is not None and applied is not None and applied(data):
+                logger.debug(f"Node {node} says an earlier attempt went through")
+                return node, data
+            self._check(node, data)
+            if accept is None or accept(data):
+                return node, data
+            logger.debug(f"Node {node} returned an unusable response, trying another")
+            self.pool.quarantine(node)
 
+        if node is not None and data is not None:
+            return node, data
         raise PodpingConnectionError(f"All nodes failed. Last error: {last_error}")
 
+    def _check(self, node: str, data: Any) -> Any:
+        if isinstance(data, dict) and "error" in data:
+            self.pool.record_failure(node, quarantine=False)
+            raise PodpingNetworkError(_format_rpc_error(data["error"]))
+        return data
+
+    async def _send_hedged(self, payload: dict, delay: Optional[float]) -> Any:
+        """Like :meth:`_send`, but races a second node if the first is slow."""
+        if not self._session:
+            raise PodpingConnectionError("Use 'async with HiveClient() as client:'.")
+
+        nodes = self.pool.ranked()[:2]
+        self._hedge_tokens = min(self._hedge_tokens + self.hedge_budget, 10.0)
+        if len(nodes) < 2:
+            return await self._send(payload)
+
+        if delay is None:
+            delay = self.pool.percentile(nodes[0], 0.9) or 1.0
+
+        started = time.monotonic()
+        tasks = {asyncio.ensure_future(self._post(nodes[0], payload)): nodes[0]}
+        pending = set(tasks)
+        try:
+            done, _ = await asyncio.wait(list(tasks), timeout=delay)
+            if not done and self._hedge_tokens >= 1:
+                self._hedge_tokens -= 1
+                logger.debug(f"Hedging {payload['method']} to {nodes[1]}")
+                tasks[asyncio.ensure_future(self._post(nodes[1], payload))] = nodes[1]
+                pending = set(tasks)
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return self._check(tasks[task], task.result())
+                    logger.debug(f"Node {tasks[task]} failed: {task.exception()}")
+                    self.pool.record_failure(tasks[task])
+        finally:
+            for task in pending:
+                task.cancel()
+                if len(pending) < len(tasks):
+                    # The loser took at least this long, so it shouldn't look fast
+                    self.pool.record_latency(tasks[task], time.monotonic() - started)
+
+        return await self._send(payload)
+
+    async def _probe(self, node: str) -> None:
+        try:
+            await self._post(
+                node, self._request("condenser_api.get_dynamic_global_properties")
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError) as e:
+            logger.debug(f"Node {node} failed: {e}")
+            self.pool.record_failure(node)
+
+    async def check_heads(self) -> None:
+        """Fetch the head block from every node, demoting those that lag behind."""
+        await asyncio.gather(*(self._probe(node) for node in self.nodes))
+        for node in self.nodes:
+            if self.pool.lag(node) > self.pool.max_lag:
+                logger.debug(f"Node {node} is {self.pool.lag(node)} blocks behind")
+                self.pool.quarantine(node)
+
+    async def _probe_loop(self, prober: _Prober) -> None:
+        """Re-probe quarantined nodes and cross-check node heads in the background."""
+        while True:
+            if prober.head_check_due(self.head_check_interval):
+                prober.last_head_check = time.monotonic()
+                await self.check_heads()
+            else:
+                await asyncio.gather(
+                    *(self._probe(node) for node in self.pool.due_for_probe())
+                )
+            await asyncio.sleep(self.probe_interval)
+
+    def _request(self, method: str, params: Any = None) -> dict:
+        return {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params if params is not None else [],
+            "id": next(self._request_ids),
+        }
+
+    async def rpc_call(self, method: str, params: Any = None) -> dict:
+        payload = self._request(method, params)
+        if method in self.hedge:
+            data = await self._send_hedged(payload, self.hedge[method])
+        else:
+            data = await self._send(payload)
+        result: dict = data["result"]
+        return result
+
+    async def rpc_batch(
+        self, calls: Sequence[Tuple[str, Any]], return_exceptions: bool = False
+    ) -> list:
+        """Send several ``(method, params)`` calls in a single JSON-RPC batch POST.
+
+        Results are returned in the order of ``calls``. A failed item raises
+        :class:`PodpingNetworkError`, or is returned in its slot when
+        ``return_exceptions`` is true.
+        """
+        if not calls:
+            return []
+
+        requests = [self._request(method, params) for method, params in calls]
+        data = await self._send(requests)
+        if not isinstance(data, list):
+            raise PodpingNetworkError(f"Unexpected batch response: {data!r}")
+
+        by_id = {item.get("id"): item for item in data if isinstance(item, dict)}
+        results = []
+        result: Any
+        for request in requests:
+            item = by_id.get(request["id"])
+            if item is None:
+                result = PodpingNetworkError(f"No response for {request['method']}")
+            elif "error" in item:
+                result = PodpingNetworkError(_format_rpc_error(item["error"]))
+            else:
+                result = item.get("result")
+
+            if isinstance(result, PodpingNetworkError) and not return_exceptions:
+                raise result
+            results.append(result)
+
+        return results
+
+    async def subscribe_blocks(self, url: str) -> AsyncIterator[dict]:
+        """Yield block headers pushed by a WebSocket node as blocks are applied.
+
+        Uses ``set_block_applied_callback``, which only some nodes expose. Each
+        header gets a ``block_num`` key. Raises :class:`PodpingConnectionError` if
+        the node refuses the subscription or the connection drops.
+        """
+        if not self._session:
+            raise PodpingConnectionError("Use 'async with HiveClient() as client:'.")
+
+        request = self._request("condenser_api.set_block_applied_callback", [0])
+        try:
+            async with self._session.ws_connect(url, heartbeat=30.0) as ws:
+                await ws.send_json(request)
+                async for msg in ws:
+                    if msg.type != aiohttp.WSMsgType.TEXT:
+                        break
+                    data = msg.json()
+                    if data.get("id") == request["id"] and "error" in data:
+                        raise PodpingConnectionError(
+                            f"Block subscription refused: {_format_rpc_error(data['error'])}"
+                        )
+                    if data.get("method") != "notice":
+                        continue
+                    for header in data["params"][1]:
+                        # Block numbers are encoded in the first 4 bytes of the block id
+                        header["block_num"] = int(header["previous"][:8], 16) + 1
+                        yield header
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            raise PodpingConnectionError(f"Block subscription to {url} failed: {e}") from e
+        raise PodpingConnectionError(f"Block subscription to {url} closed")
+
+    async def broadcast_transaction(self, trx: dict, avoid: Iterable[str] = ()) -> str:
+        """Broadcast a signed transaction, trying nodes in ``avoid`` last.
+
+        Returns the node that accepted it. If a node fails mid-request and the
+        next reports the transaction as a duplicate, the failed node applied
+        it, and this counts as success.
+        """
+        payload = self._request(
+            "network_broadcast_api.broadcast_transaction", {"trx": trx, "max_block_age": -1}
+        )
+        node, _ = await self._send_via(
+            payload, avoid=avoid, applied=_is_duplicate_transaction
+        )
+        return node
+
     async def get_dynamic_global_properties(self) -> dict:
         return await self.rpc_call("condenser_api.get_dynamic_global_properties")
 
-    async def get_block(self, block_num: int) -> dict:
-        return await self.rpc_call("condenser_api.get_block", [block_num])
+    async def get_block(self, block_num: int, required: bool = False) -> Optional[dict]:
+        """Fetch a block, or ``None`` if it doesn't exist yet.
+
+        With ``required=True`` the block is known to exist, so a node answering
+        ``None`` for a block at least two below the nodes' head is lagging: it is
+        demoted and the request is retried elsewhere. Nearer the head, nodes may
+        just be a moment behind whoever announced the block, so the request is
+        retried after a short delay first.
+        """
+        if not required:
+            return await self.rpc_call("condenser_api.get_block", [block_num])
+
+        payload = self._request("condenser_api.get_block", [block_num])
+        deadline = time.monotonic() + BLOCK_INTERVAL
+        while time.monotonic() < deadline:
+            head = self.pool.head_block
+            if head is None or block_num < head - 1:
+                break
+            data = await self._send(payload)
+            block: Optional[dict] = data.get("result")
+            if block is not None:
+                return block
+            await asyncio.sleep(NEAR_HEAD_RETRY_DELAY)
+
+        data = await self._send(payload, accept=lambda d: d.get("result") is not None)
+        block = data["result"]
+        return block
+
+    async def get_block_header(self, block_num: int) -> dict:
+        return await self.rpc_call("condenser_api.get_block_header", [block_num])
+
+    async def get_block_range(self, start: int, count: int) -> List[Optional[dict]]:
+        """Fetch ``count`` consecutive blocks starting at ``start`` in one call.
+
+        Blocks are returned in the same shape as :meth:`get_block`. Blocks the node
+        did not return (e.g. past the head) are ``None``.
+        """
+        count = min(count, BLOCK_RANGE_LIMIT)
+        result = await self.rpc_call(
+            "block_api.get_block_range", {"starting_block_num": start, "count": count}
+        )
+        blocks = [_normalize_block(b) for b in result.get("blocks", [])]
+        return blocks + [None] * (count - len(blocks))
+
+    async def get_blocks(self, block_nums: Iterable[int]) -> List[Optional[dict]]:
+        """Fetch several blocks in one batch request. Failed blocks are ``None``."""
+        calls = [("condenser_api.get_block", [n]) for n in block_nums]
+        blocks = await self.rpc_batch(calls, return_exceptions=True)
+        for (_, params), block in zip(calls, blocks):
+            if isinstance(block, Exception):
+                logger.debug(f"Failed to fetch block {params[0]}: {block}")
+        return [None if isinstance(b, Exception) else b for b in blocks]
 
 
 class HiveWriter:
-    """Lighthive wrapper that exposes an async interface via a thread pool."""
+    """Signs transactions locally and broadcasts them over :class:`HiveClient`.
+
+    The reference block used for TaPoS and the chain id are cached, with the
+    reference block refreshed in the background every ``ref_refresh_interval``
+    seconds, so building a transaction needs no extra round-trips.
+    """
 
-    def __init__(self, account: str, posting_key: str, nodes: Optional[List[str]] = None):
+    def __init__(
+        self,
+        account: str,
+        posting_key: str,
+        nodes: Optional[List[str]] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        chain_id: Optional[str] = None,
+        expiration: float = 60.0,
+        ref_refresh_interval: float = 30.0,
+    ):
         self.account = account
         self.nodes = nodes or HIVE_NODES.copy()
-        self._client = Client(
-            keys=[posting_key],
-            nodes=self.nodes,
-            connect_timeout=10.0,
-            read_timeout=30.0,
+        self.chain_id = chain_id
+        self.expiration = expiration
+        self.ref_refresh_interval = ref_refresh_interval
+        self._secret = decode_private_key(posting_key)
+        self._client = HiveClient(self.nodes, connector=connector)
+        self._open = False
+        # (ref_block_num, ref_block_prefix, head block time, monotonic fetch time)
+        self._ref_block: Optional[Tuple[int, int, datetime, float]] = None
+        self._ref_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.rc = RCEstimator()
+
+    async def _hive(self) -> HiveClient:
+        if not self._open:
+            await self._client.__aenter__()
+            self._open = True
+            self._ref_lock = asyncio.Lock()
+            self._refresh_task = asyncio.ensure_future(self._refresh_loop())
+        return self._client
+
+    async def close(self) -> None:
+        if self._open:
+            self._open = False
+            if self._refresh_task:
+                self._refresh_task.cancel()
+            await self._client.__aexit__(None, None, None)
+
+    async def _refresh_ref_block(self) -> None:
+        client = await self._hive()
+        if self.chain_id is None:
+            try:
+                version = await client.rpc_call("database_api.get_version", {})
+                self.chain_id = version["chain_id"]
+            except Exception as e:
+                logger.debug(f"Failed to get chain id, assuming Hive mainnet: {e}")
+                self.chain_id = HIVE_CHAIN_ID
+
+        props = await client.get_dynamic_global_properties()
+        ref_block = props["head_block_number"]
+        ref_block_prefix = struct.unpack_from("<I", bytes.fromhex(props["head_block_id"]), 4)[0]
+        head_time = datetime.fromisoformat(props["time"]).replace(tzinfo=timezone.utc)
+        self._ref_block = (ref_block, ref_block_prefix, head_time, time.monotonic())
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.ref_refresh_interval)
+            try:
+                await self._refresh_ref_block()
+            except Exception as e:
+                logger.debug(f"Failed to refresh reference block: {e}")
+
+    def _ref_block_stale(self) -> bool:
+        # Background refreshes keep it fresh; only refetch inline if they stopped
+        return self._ref_block is None or (
+            time.monotonic() - self._ref_block[3] > self.ref_refresh_interval * 4
         )
 
-    async def _run(self, fn, *args):
-        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+    async def _transaction_header(self) -> Tuple[int, int, datetime]:
+        """Return ``(ref_block, ref_block_prefix, expiration)`` for a new transaction.
+
+        ``ref_block`` is the full number of the referenced block.
+        """
+        await self._hive()
+        lock = self._ref_lock
+        if lock is not None and self._ref_block_stale():
+            async with lock:
+                # Another caller may have refreshed it while we waited
+                if self._ref_block_stale():
+                    await self._refresh_ref_block()
+
+        if self._ref_block is None:
+            raise PodpingNetworkError("No reference block available")
+        ref_block, ref_block_prefix, head_time, fetched_at = self._ref_block
+        # Estimate the current chain time from the cached head time
+        now = head_time + timedelta(seconds=time.monotonic() - fetched_at)
+        return ref_block, ref_block_prefix, now + timedelta(seconds=self.expiration)
 
     async def broadcast_operation(self, operation: Operation) -> dict:
+        return await self.broadcast_operations([operation])
+
+    async def broadcast_operations(
+        self, operations: List[Operation], avoid: Iterable[str] = ()
+    ) -> dict:
+        """Sign and broadcast several operations as a single transaction.
+
+        Nodes in ``avoid`` are tried last. Returns ``{"id": tx_id, "expiration":
+        datetime, "node": url, "ref_block": int}``. The transaction can only be
+        in blocks after ``ref_block``.
+        """
+        if len(operations) > HIVE_CUSTOM_OP_BLOCK_LIMIT:
+            raise PodpingValidationError(
+                f"At most {HIVE_CUSTOM_OP_BLOCK_LIMIT} operations fit in one transaction"
+            )
+
         try:
-            return await self._run(self._client.broadcast, [operation])
+            client = await self._hive()
+            ref_block, ref_block_prefix, expiration = await self._transaction_header()
+            ref_block_num = ref_block & 0xFFFF
+            tx_bytes = serialize_transaction(
+                ref_block_num, ref_block_prefix, expiration, operations
+            )
+            if len(tx_bytes) + SIGNATURE_SIZE > HIVE_MAX_TRANSACTION_SIZE:
+                raise PodpingValidationError("Transaction exceeds 64KB limit")
+
+            trx = {
+                "ref_block_num": ref_block_num,
+                "ref_block_prefix": ref_block_prefix,
+                "expiration": expiration.strftime("%Y-%m-%dT%H:%M:%S"),
+                "operations": [
+                    {"type": f"{op.type}_operation", "value": op.op_value}
+                    for op in operations
+                ],
+                "extensions": [],
+                "signatures": [
+                    sign_transaction(
+                        tx_bytes, self._secret, self.chain_id or HIVE_CHAIN_ID
+                    )
+                ],
+            }
+            node = await client.broadcast_transaction(trx, avoid)
+            self.rc.charge(len(tx_bytes) + SIGNATURE_SIZE)
+            return {
+                "id": transaction_id(tx_bytes),
+                "expiration": expiration,
+                "node": node,
+                "ref_block": ref_block,
+            }
+        except PodpingValidationError:
+            raise
         except Exception as e:
-            self._client.next_node()
+            self.rc.invalidate()
             raise PodpingNetworkError(f"Failed to broadcast: {_format_rpc_error(e)}") from e
 
     async def get_account_rc(self) -> float:
-        """Return account Resource Credits as a percentage (0–100)."""
+        """Return account Resource Credits as a percentage (0–100).
+
+        Served from the local :class:`RCEstimator`, which only asks a node when a
+        resync is due.
+        """
         try:
-            account = await self._run(Account, self._client, self.account)
-            return await self._run(account.rc) or 0.0
+            if self.rc.needs_sync():
+                rc_accounts = await self.find_rc_accounts([self.account])
+                self.rc.sync(rc_accounts[self.account])
+            return self.rc.percentage()
         except Exception as e:
             logger.debug(f"Failed to get RC: {e}")
-            self._client.next_node()
-            return 0.0
\ No newline at end of file
+            return 0.0
+
+    async def find_rc_accounts(self, accounts: List[str]) -> Dict[str, dict]:
+        """Fetch the ``rc_api.find_rc_accounts`` entry of each account in one call."""
+        client = await self._hive()
+        result = await client.rpc_call("rc_api.find_rc_accounts", {"accounts": accounts})
+        return {entry["account"]: entry for entry in result["rc_accounts"]}
@@ -0,0 +1,285 @@
+"""Broadcast confirmation tracking."""
+
+import asyncio
+import heapq
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+import aiohttp
+
+from .client import HEDGED_METHODS, HIVE_NODES, HiveClient
+from .errors import PodpingError
+from .scheduler import BLOCK_INTERVAL, BlockScheduler
+
+logger = logging.getLogger(__name__)
+
+# Blocks whose transaction ids are kept, to confirm transactions tracked late
+SCAN_WINDOW = 60
+
+
+@dataclass
+class _Tracked:
+    future: asyncio.Future
+    expiration: datetime
+    irreversible: bool
+    tracked_at: float = field(default_factory=time.monotonic)
+    # Block the transaction was seen in, while waiting for it to become irreversible
+    block_num: Optional[int] = None
+    result: Optional[dict] = None
+
+
+class BlockFollower:
+    """
+    Follow new blocks and resolve a future for each tracked transaction seen in one.
+
+    Pending transaction ids are kept in a dict, so a block costs one lookup per
+    transaction in it however many are pending. The ids in recently scanned
+    blocks are kept too, so a transaction tracked after its block went past is
+    found without fetching anything again. Expirations, and blocks waiting to
+    become irreversible, are kept in heaps. Each block's ``previous`` id is
+    checked against the block before it, so a fork is noticed and the
+    transactions in orphaned blocks go back to pending. The follower only polls
+    while something is pending. One follower can be shared by several writers.
+    """
+
+    def __init__(
+        self,
+        nodes: Optional[List[str]] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+    ):
+        self.nodes = nodes or HIVE_NODES.copy()
+        self._client = HiveClient(
+            self.nodes, hedge=HEDGED_METHODS, connector=connector, head_checks=True
+        )
+        self._open = False
+        self._scheduler = BlockScheduler()
+        self._pending: Dict[str, _Tracked] = {}
+        self._expirations: List[Tuple[datetime, str]] = []
+        # Blocks with tracked transactions, waiting to become irreversible
+        self._included: Dict[int, List[str]] = {}
+        self._unfinalized: List[int] = []
+        # Ids of reversible blocks seen so far, to notice forks
+        self._block_ids: Dict[int, str] = {}
+        # Transaction ids of the last SCAN_WINDOW blocks followed
+        self._scanned: Dict[int, Set[str]] = {}
+        # Older blocks a newly tracked transaction may be in, never scanned
+        self._backfill: Set[int] = set()
+        self._head: Optional[int] = None
+        self._irreversible: Optional[int] = None
+        self._next_block: Optional[int] = None
+        # Where to start following, if a transaction is tracked while idle
+        self._start_block: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def track(
+        self,
+        tx_id: str,
+        expiration: datetime,
+        irreversible: bool = False,
+        after_block: Optional[int] = None,
+    ) -> asyncio.Future:
+        """Return a future resolving to ``{"tx_id", "block_num", "latency"}`` once
+        ``tx_id`` is in a block.
+
+        With ``irreversible``, the future only resolves once that block is
+        irreversible, and a transaction orphaned by a fork goes back to waiting.
+        It fails with :class:`PodpingError` if a block past ``expiration``
+        arrives while the transaction is not in the chain.
+
+        Blocks are searched from ``after_block + 1``, e.g. the transaction's
+        reference block, even if the follower has moved past it. Without it,
+        the search starts just before the head seen when following begins.
+        """
+        if tx_id in self._pending:
+            return self._pending[tx_id].future
+
+        idle = self._task is None or self._task.done()
+        future = asyncio.get_running_loop().create_future()
+        entry = self._pending[tx_id] = _Tracked(future, expiration, irreversible)
+        heapq.heappush(self._expirations, (expiration, tx_id))
+        if after_block is not None:
+            self._search_from(after_block + 1, tx_id, entry, idle)
+        elif idle:
+            self._next_block = None
+        if idle:
+            self._task = asyncio.ensure_future(self._follow())
+        return future
+
+    def _search_from(self, start: int, tx_id: str, entry: _Tracked, idle: bool) -> None:
+        """Look for ``tx_id`` in blocks from ``start`` the follower already passed."""
+        if self._next_block is None:
+            if self._start_block is None or start < self._start_block:
+                self._start_block = start
+            return
+        if idle and start > self._next_block:
+            # Nothing pending needs the blocks in between
+            self._next_block = start
+            return
+
+        missing = []
+        for block_num in range(start, self._next_block):
+            tx_ids = self._scanned.get(block_num)
+            if tx_ids is None:
+                missing.append(block_num)
+            elif tx_id in tx_ids:
+                self._include(block_num, tx_id, entry, time.monotonic())
+                return
+        self._backfill.update(missing)
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        for entry in self._pending.values():
+            entry.future.cancel()
+        self._pending.clear()
+        if self._open:
+            self._open = False
+            await self._client.__aexit__(None, None, None)
+
+    async def _poll_head(self) -> Tuple[int, int]:
+        """Fetch the head; return it and the next block to follow."""
+        props = await self._client.get_dynamic_global_properties()
+        head = props["head_block_number"]
+        head_time = datetime.fromisoformat(props["time"]).replace(tzinfo=timezone.utc)
+        if not self._scheduler.observe(head, head_time.timestamp()):
+            self._scheduler.miss()
+        self._head = head
+        if self._next_block is None:
+            # The head may have moved on while the transaction was broadcast
+            self._next_block = head - 1
+        self._finalize(props["last_irreversible_block_num"])
+        return head, self._next_block
+
+    async def _follow(self) -> None:
+        if not self._open:
+            await self._client.__aenter__()
+            self._open = True
+
+        while self._pending:
+            if self._next_block is None and self._start_block is not None:
+                self._next_block = self._start_block
+            self._start_block = None
+
+            try:
+                if self._backfill:
+                    old_block = min(self._backfill)
+                    self._scan(old_block, await self._get_block(old_block))
+                    self._backfill.discard(old_block)
+                    continue
+
+                next_block, head = self._next_block, self._head
+                if next_block is None or head is None or next_block > head:
+                    head, next_block = await self._poll_head()
+                    if next_block > head:
+                        await asyncio.sleep(self._scheduler.delay())
+                        continue
+
+                block_num = next_block
+                block = await self._get_block(block_num)
+                previous = self._block_ids.get(block_num - 1)
+                if previous is not None and block["previous"] != previous:
+                    logger.debug(f"Block {block_num - 1} was orphaned by a fork")
+                    self._orphan(block_num - 1)
+                    self._next_block = block_num - 1
+                    continue
+
+                if self._irreversible is None or block_num > self._irreversible:
+                    self._block_ids[block_num] = block["block_id"]
+                self._scanned[block_num] = set(block.get("transaction_ids", []))
+                while next(iter(self._scanned)) <= block_num - SCAN_WINDOW:
+                    del self._scanned[next(iter(self._scanned))]
+                self._scan(block_num, block)
+                timestamp = datetime.fromisoformat(block["timestamp"]).replace(
+                    tzinfo=timezone.utc
+                )
+                self._expire(timestamp)
+                self._next_block = block_num + 1
+            except Exception as e:
+                logger.debug(f"Failed to follow block {self._next_block}: {e}")
+                await asyncio.sleep(BLOCK_INTERVAL)
+
+        # Only settled transactions are left. The scanned blocks are kept for
+        # the next transaction tracked
+        self._expirations.clear()
+        self._included.clear()
+        self._unfinalized.clear()
+        self._backfill.clear()
+
+    async def _get_block(self, block_num: int) -> dict:
+        block = await self._client.get_block(block_num, required=True)
+        if block is None:
+            raise PodpingError(f"Block {block_num} is not available yet")
+        return block
+
+    def _scan(self, block_num: int, block: dict) -> None:
+        now = time.monotonic()
+        for tx_id in block.get("transaction_ids", []):
+            entry = self._pending.get(tx_id)
+            if entry is not None and entry.block_num is None:
+                self._include(block_num, tx_id, entry, now)
+
+    def _include(self, block_num: int, tx_id: str, entry: _Tracked, now: float) -> None:
+        entry.result = {
+            "tx_id": tx_id,
+            "block_num": block_num,
+            "latency": now - entry.tracked_at,
+        }
+        if entry.irreversible:
+            entry.block_num = block_num
+            included = self._included.setdefault(block_num, [])
+            if not included:
+                heapq.heappush(self._unfinalized, block_num)
+            included.append(tx_id)
+        else:
+            del self._pending[tx_id]
+            if not entry.future.done():
+                entry.future.set_result(entry.result)
+
+    def _expire(self, timestamp: datetime) -> None:
+        """Fail transactions that expired before a block at ``timestamp``."""
+        while self._expirations and self._expirations[0][0] < timestamp:
+            _, tx_id = heapq.heappop(self._expirations)
+            entry = self._pending.get(tx_id)
+            if entry is None or entry.block_num is not None:
+                continue
+            del self._pending[tx_id]
+            if not entry.future.done():
+                entry.future.set_exception(
+                    PodpingError(f"Transaction {tx_id} expired without being included")
+                )
+
+    def _finalize(self, irreversible: int) -> None:
+        """Resolve transactions in blocks up to ``irreversible``."""
+        while self._unfinalized and self._unfinalized[0] <= irreversible:
+            block_num = heapq.heappop(self._unfinalized)
+            for tx_id in self._included.pop(block_num, []):
+                entry = self._pending.get(tx_id)
+                if entry is None or entry.block_num != block_num:
+                    continue
+                del self._pending[tx_id]
+                if not entry.future.done():
+                    entry.future.set_result(entry.result)
+
+        for block_num in [n for n in self._block_ids if n <= irreversible]:
+            del self._block_ids[block_num]
+        self._irreversible = irreversible
+
+    def _orphan(self, block_num: int) -> None:
+        """Put transactions seen in an orphaned block back to pending."""
+        self._block_ids.pop(block_num, None)
+        self._scanned.pop(block_num, None)
+        for tx_id in self._included.pop(block_num, []):
+            entry = self._pending.get(tx_id)
+            if entry is None or entry.block_num != block_num:
+                continue
+            entry.block_num = None
+            entry.result = None
+            heapq.heappush(self._expirations, (entry.expiration, tx_id))
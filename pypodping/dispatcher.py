@@ -0,0 +1,98 @@
+"""Concurrent callback dispatch for the PodPing watcher."""
+
+import asyncio
+import dataclasses
+import logging
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional
+
+from .types import PodpingData
+
+logger = logging.getLogger(__name__)
+
+
+class CallbackDispatcher:
+    """Run update callbacks on a pool of worker tasks, off the block ingestion path.
+
+    With ``ordered=True`` updates are sharded by feed URL, so updates for the same
+    feed are always handled by the same worker, one at a time and in block order.
+    An update carrying URLs from several shards is split into one
+    :class:`PodpingData` per shard. Sync callbacks run in ``executor`` (the
+    default thread pool if not given).
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_pending: int = 1000,
+        ordered: bool = True,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.ordered = ordered
+        self.executor = executor
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+
+        if self.ordered:
+            size = max(1, self.max_pending // self.workers)
+            self._queues = [asyncio.Queue(size) for _ in range(self.workers)]
+            queues = self._queues
+        else:
+            self._queues = [asyncio.Queue(self.max_pending)]
+            queues = self._queues * self.workers
+
+        self._tasks = [asyncio.ensure_future(self._worker(q)) for q in queues]
+
+    async def submit(self, callback: Callable, data: PodpingData) -> None:
+        """Queue ``callback(data)``, waiting while the queue is full."""
+        if not self.ordered:
+            await self._queues[0].put((callback, data))
+            return
+
+        shards: Dict[int, List[str]] = {}
+        for url in data.urls:
+            shards.setdefault(hash(url) % len(self._queues), []).append(url)
+
+        for idx, urls in shards.items():
+            item = data if len(shards) == 1 else dataclasses.replace(data, urls=urls)
+            await self._queues[idx].put((callback, item))
+
+    @property
+    def pending(self) -> int:
+        """Number of callbacks queued but not yet started."""
+        return sum(q.qsize() for q in self._queues)
+
+    async def join(self) -> None:
+        """Wait until every submitted callback has finished."""
+        for queue in self._queues:
+            await queue.join()
+
+    async def close(self) -> None:
+        """Finish the queued callbacks, then stop the workers."""
+        try:
+            await self.join()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            callback, data = await queue.get()
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    await callback(data)
+                else:
+                    await loop.run_in_executor(self.executor, callback, data)
+            except Exception as e:
+                logger.warning(f"Callback failed for block {data.block_num}: {e}")
+            finally:
+                queue.task_done()
@@ -24,3 +24,15 @@ class PodpingValidationError(PodpingError):
 class PodpingNetworkError(PodpingError):
     """Network-related error during operations."""
     pass
+
+
+class PodpingBatchError(PodpingError):
+    """Some notifications in a batch failed to post.
+
+    ``results`` holds the outcome of every notification: a result dict for those
+    that were posted, and the exception for those that weren't.
+    """
+
+    def __init__(self, message: str, results: list):
+        super().__init__(message)
+        self.results = results
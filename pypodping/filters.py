@@ -0,0 +1,185 @@
+"""Subscription filters for routing watcher updates to handlers."""
+
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .types import PodpingData
+
+FilterValues = Optional[Union[str, Iterable[str]]]
+
+
+def _to_set(values: FilterValues) -> Optional[FrozenSet[str]]:
+    if values is None:
+        return None
+    if isinstance(values, str):
+        return frozenset([values])
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class PodpingFilter:
+    """
+    Declarative filter for a watcher subscription.
+
+    Each field takes a string or an iterable of strings; ``None`` matches anything.
+    ``hosts`` and ``url_prefixes`` select individual URLs: a URL passes if its host
+    is listed or it starts with one of the prefixes, and only passing URLs are
+    delivered.
+    """
+
+    medium: Optional[FrozenSet[str]] = None
+    reason: Optional[FrozenSet[str]] = None
+    accounts: Optional[FrozenSet[str]] = None
+    version: Optional[FrozenSet[str]] = None
+    hosts: Optional[FrozenSet[str]] = None
+    url_prefixes: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def create(
+        cls,
+        medium: FilterValues = None,
+        reason: FilterValues = None,
+        accounts: FilterValues = None,
+        version: FilterValues = None,
+        hosts: FilterValues = None,
+        url_prefixes: FilterValues = None,
+    ) -> "PodpingFilter":
+        host_set = _to_set(hosts)
+        return cls(
+            medium=_to_set(medium),
+            reason=_to_set(reason),
+            accounts=_to_set(accounts),
+            version=_to_set(version),
+            hosts=frozenset(h.lower() for h in host_set) if host_set else host_set,
+            url_prefixes=_to_set(url_prefixes),
+        )
+
+
+class _PrefixTrie:
+    """Character trie mapping URL prefixes to subscriber bitmasks."""
+
+    def __init__(self) -> None:
+        self._root: Dict[str, Any] = {}
+
+    def add(self, prefix: str, mask: int) -> None:
+        node = self._root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[""] = node.get("", 0) | mask
+
+    def match(self, url: str) -> int:
+        """Return the combined mask of every prefix of ``url`` in the trie."""
+        mask = 0
+        node = self._root
+        for char in url:
+            child = node.get(char)
+            if child is None:
+                break
+            node = child
+            mask |= node.get("", 0)
+        return mask
+
+
+# Fields matched once per operation, in PodpingFilter order
+_FIELDS = ("medium", "reason", "accounts", "version")
+
+
+class SubscriptionIndex:
+    """
+    Route updates to every matching subscriber.
+
+    Subscribers are numbered and each filter value maps to a bitmask of the
+    subscribers that accept it, so matching an operation costs one hash lookup
+    per field plus one per URL, however many subscribers there are.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: List[Tuple[Any, PodpingFilter]] = []
+        self._compiled = False
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def add(self, handler: Any, filter: Optional[PodpingFilter] = None) -> None:
+        self._subscribers.append((handler, filter or PodpingFilter()))
+        self._compiled = False
+
+    def remove(self, handler: Any) -> None:
+        self._subscribers = [s for s in self._subscribers if s[0] != handler]
+        self._compiled = False
+
+    def _compile(self) -> None:
+        self._all = (1 << len(self._subscribers)) - 1
+        self._field_index: List[Tuple[int, Dict[str, int]]] = []
+        for field in _FIELDS:
+            wildcard = 0
+            index: Dict[str, int] = {}
+            for bit, (_, flt) in enumerate(self._subscribers):
+                values = getattr(flt, field)
+                if values is None:
+                    wildcard |= 1 << bit
+                    continue
+                for value in values:
+                    index[value] = index.get(value, 0) | 1 << bit
+            self._field_index.append((wildcard, index))
+
+        self._url_filtered = 0
+        self._hosts: Dict[str, int] = {}
+        self._prefixes = _PrefixTrie()
+        for bit, (_, flt) in enumerate(self._subscribers):
+            if flt.hosts is None and flt.url_prefixes is None:
+                continue
+            self._url_filtered |= 1 << bit
+            for host in flt.hosts or ():
+                self._hosts[host] = self._hosts.get(host, 0) | 1 << bit
+            for prefix in flt.url_prefixes or ():
+                self._prefixes.add(prefix, 1 << bit)
+
+        self._compiled = True
+
+    def _url_mask(self, url: str) -> int:
+        try:
+            host = (urlsplit(url).hostname or "").lower()
+        except ValueError:
+            host = ""
+        return self._hosts.get(host, 0) | self._prefixes.match(url)
+
+    def match(self, data: PodpingData) -> List[Tuple[Any, PodpingData]]:
+        """Return ``(handler, data)`` pairs for every subscriber accepting ``data``.
+
+        When a subscriber filters URLs, its ``data`` only carries the URLs it accepts.
+        """
+        if not self._subscribers:
+            return []
+        if not self._compiled:
+            self._compile()
+
+        mask = self._all
+        values = (data.medium, data.reason, data.account, data.version)
+        for (wildcard, index), value in zip(self._field_index, values):
+            mask &= wildcard | index.get(value, 0)
+            if not mask:
+                return []
+
+        url_masks: List[int] = []
+        if mask & self._url_filtered:
+            url_masks = [self._url_mask(url) for url in data.urls]
+
+        matches = []
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            handler, _ = self._subscribers[low.bit_length() - 1]
+            if not low & self._url_filtered:
+                matches.append((handler, data))
+                continue
+
+            urls = [url for url, m in zip(data.urls, url_masks) if m & low]
+            if len(urls) == len(data.urls):
+                matches.append((handler, data))
+            elif urls:
+                matches.append((handler, dataclasses.replace(data, urls=urls)))
+
+        return matches
@@ -0,0 +1,160 @@
+"""Health tracking and selection for Hive API nodes."""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Optional
+
+
+@dataclass
+class NodeStats:
+    """
+    Observed health of a single Hive API node.
+
+    Attributes:
+        url: Node endpoint
+        latency: Exponentially weighted average response time in seconds
+        error_rate: Exponentially weighted share of failed requests (0–1)
+        head_block: Last head block number the node reported
+        head_at: Monotonic time ``head_block`` was reported
+        failures: Consecutive failures since the last success
+        quarantined: Whether the node is excluded from routing
+        retry_at: Monotonic time when a quarantined node may be re-probed
+        samples: Recent response times, for percentiles
+    """
+
+    url: str
+    latency: Optional[float] = None
+    error_rate: float = 0.0
+    head_block: Optional[int] = None
+    head_at: float = 0.0
+    failures: int = 0
+    quarantined: bool = False
+    retry_at: float = 0.0
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=100), repr=False)
+
+
+class NodePool:
+    """
+    Route requests to the healthiest node.
+
+    Nodes are scored by latency, error rate and how far their head block lags the
+    best known head. A node that fails, or lags more than ``max_lag`` blocks, is
+    quarantined until a background probe finds it healthy; probes are spaced with
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        nodes: Iterable[str],
+        alpha: float = 0.2,
+        base_backoff: float = 5.0,
+        max_backoff: float = 300.0,
+        block_interval: float = 3.0,
+        max_lag: int = 10,
+    ) -> None:
+        self.stats: Dict[str, NodeStats] = {url: NodeStats(url) for url in nodes}
+        self.alpha = alpha
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.block_interval = block_interval
+        self.max_lag = max_lag
+
+    def _projected_head(self, stats: NodeStats, now: float) -> Optional[float]:
+        # Nodes report their head at different times, so compare where each
+        # head should be by now
+        if stats.head_block is None:
+            return None
+        return stats.head_block + (now - stats.head_at) / self.block_interval
+
+    def _best_head(self, now: float) -> Optional[float]:
+        heads = [self._projected_head(s, now) for s in self.stats.values()]
+        known = [head for head in heads if head is not None]
+        return max(known) if known else None
+
+    @property
+    def head_block(self) -> Optional[int]:
+        """Highest head block any node is expected to be at by now."""
+        head = self._best_head(time.monotonic())
+        return int(head) if head is not None else None
+
+    def lag(self, url: str) -> int:
+        """Blocks ``url`` is behind the best known head, projected to now."""
+        now = time.monotonic()
+        head = self._best_head(now)
+        node_head = self._projected_head(self.stats[url], now)
+        if head is None or node_head is None:
+            return 0
+        return round(head - node_head)
+
+    def score(self, url: str) -> float:
+        """Expected cost of a request in seconds; lower is better."""
+        stats = self.stats[url]
+        # Untried nodes score like a fast node so they get a chance
+        latency = stats.latency if stats.latency is not None else 0.2
+        return (
+            latency * (1 + 4 * stats.error_rate) + self.lag(url) * self.block_interval
+        )
+
+    def ranked(self, exclude: Iterable[str] = ()) -> List[str]:
+        """Nodes from best to worst; quarantined nodes last, soonest retry first."""
+        excluded = set(exclude)
+        healthy = [s.url for s in self.stats.values() if not s.quarantined]
+        quarantined = [s for s in self.stats.values() if s.quarantined]
+        ranked = sorted(healthy, key=self.score)
+        ranked += [s.url for s in sorted(quarantined, key=lambda s: s.retry_at)]
+        return [url for url in ranked if url not in excluded]
+
+    def best(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        ranked = self.ranked(exclude)
+        return ranked[0] if ranked else None
+
+    def due_for_probe(self) -> List[str]:
+        """Quarantined nodes whose backoff has expired."""
+        now = time.monotonic()
+        return [
+            s.url for s in self.stats.values() if s.quarantined and s.retry_at <= now
+        ]
+
+    def percentile(self, url: str, q: float) -> Optional[float]:
+        """The ``q`` quantile (0–1) of recent response times, if any were recorded."""
+        samples = sorted(self.stats[url].samples)
+        if not samples:
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+    def record_latency(self, url: str, latency: float) -> None:
+        stats = self.stats[url]
+        stats.samples.append(latency)
+        if stats.latency is None:
+            stats.latency = latency
+        else:
+            stats.latency += self.alpha * (latency - stats.latency)
+
+    def record_success(
+        self, url: str, latency: float, head_block: Optional[int] = None
+    ) -> None:
+        stats = self.stats[url]
+        self.record_latency(url, latency)
+        stats.error_rate -= self.alpha * stats.error_rate
+        stats.failures = 0
+        stats.quarantined = False
+        if head_block is not None:
+            stats.head_block = head_block
+            stats.head_at = time.monotonic()
+        if self.lag(url) > self.max_lag:
+            self.quarantine(url)
+
+    def record_failure(self, url: str, quarantine: bool = True) -> None:
+        """Record a failed request, quarantining the node unless ``quarantine`` is false."""
+        stats = self.stats[url]
+        stats.error_rate += self.alpha * (1 - stats.error_rate)
+        stats.failures += 1
+        if quarantine:
+            self.quarantine(url)
+
+    def quarantine(self, url: str) -> None:
+        stats = self.stats[url]
+        backoff = self.base_backoff * 2 ** max(stats.failures - 1, 0)
+        stats.quarantined = True
+        stats.retry_at = time.monotonic() + min(backoff, self.max_backoff)
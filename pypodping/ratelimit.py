@@ -0,0 +1,101 @@
+"""Token-bucket rate limiting for broadcasts."""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+from .scheduler import BLOCK_INTERVAL
+from .transaction import HIVE_CUSTOM_OP_BLOCK_LIMIT
+
+
+class TokenBucket:
+    """
+    A token bucket that hands out reservations.
+
+    :meth:`reserve` takes tokens immediately, letting the balance go negative,
+    and returns how long the caller must wait before using them. Callers are
+    served in the order they reserve, and the debt is the current queue delay.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        # Callers may pass a time read before the bucket was created
+        if now <= self._updated:
+            return
+        self.tokens = min(
+            self.tokens + (now - self._updated) * self.rate, self.capacity
+        )
+        self._updated = now
+
+    def wait_time(self, amount: float, now: Optional[float] = None) -> float:
+        """Seconds until ``amount`` tokens would be available, without reserving them."""
+        self._refill(time.monotonic() if now is None else now)
+        return max(amount - self.tokens, 0.0) / self.rate
+
+    def reserve(self, amount: float, now: Optional[float] = None) -> float:
+        """Take ``amount`` tokens and return how long to wait before using them."""
+        wait = self.wait_time(amount, now)
+        self.tokens -= amount
+        return wait
+
+
+class RateLimiter:
+    """
+    Limit broadcasts to ``ops_per_block`` operations per account per block, and
+    optionally ``bytes_per_second`` across all accounts.
+
+    Share one limiter between writers to apply the byte cap to all of them.
+    """
+
+    def __init__(
+        self,
+        ops_per_block: int = HIVE_CUSTOM_OP_BLOCK_LIMIT,
+        bytes_per_second: Optional[float] = None,
+        block_interval: float = BLOCK_INTERVAL,
+    ) -> None:
+        self.ops_per_block = ops_per_block
+        self.block_interval = block_interval
+        self._ops: Dict[str, TokenBucket] = {}
+        self._bytes = (
+            TokenBucket(bytes_per_second, bytes_per_second)
+            if bytes_per_second
+            else None
+        )
+
+    def _account(self, account: str) -> TokenBucket:
+        bucket = self._ops.get(account)
+        if bucket is None:
+            rate = self.ops_per_block / self.block_interval
+            bucket = self._ops[account] = TokenBucket(rate, self.ops_per_block)
+        return bucket
+
+    def reserve(self, account: str, ops: int, size: int = 0) -> float:
+        """Reserve a slot for ``ops`` operations totalling ``size`` bytes; return the wait."""
+        now = time.monotonic()
+        wait = self._account(account).reserve(ops, now)
+        if self._bytes:
+            wait = max(wait, self._bytes.reserve(size, now))
+        return wait
+
+    async def acquire(self, account: str, ops: int, size: int = 0) -> float:
+        """Wait for a slot for ``ops`` operations totalling ``size`` bytes.
+
+        Returns the time spent waiting.
+        """
+        wait = self.reserve(account, ops, size)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def delay(self, account: Optional[str] = None, ops: int = 1) -> float:
+        """How long ``ops`` new operations would wait, for ``account`` or for the byte cap alone."""
+        now = time.monotonic()
+        delay = self._bytes.wait_time(0, now) if self._bytes else 0.0
+        if account is not None:
+            delay = max(delay, self._account(account).wait_time(ops, now))
+        return delay
@@ -0,0 +1,95 @@
+"""Local Resource Credit accounting for the writer."""
+
+import time
+from typing import Optional
+
+# Resource Credits regenerate fully over 5 days
+RC_REGENERATION_SECONDS = 5 * 24 * 60 * 60
+
+
+def _regenerate(mana: float, max_mana: int, elapsed: float) -> float:
+    elapsed = max(elapsed, 0.0)
+    return min(mana + elapsed * max_mana / RC_REGENERATION_SECONDS, max_mana)
+
+
+class RCEstimator:
+    """
+    Project an account's Resource Credits without asking a node every time.
+
+    The manabar is fetched once, then regenerated locally at Hive's linear rate,
+    and each broadcast subtracts an estimated cost. The cost per transaction
+    byte is learned by comparing each resync against the projection. A resync
+    is due every ``resync_interval`` seconds, or straight away after
+    :meth:`invalidate` (e.g. when a broadcast fails).
+    """
+
+    def __init__(
+        self,
+        resync_interval: float = 300.0,
+        cost_per_byte: float = 1_000_000.0,
+        alpha: float = 0.3,
+    ) -> None:
+        self.resync_interval = resync_interval
+        self.cost_per_byte = cost_per_byte
+        self.alpha = alpha
+        self.max_mana = 0
+        self._mana = 0.0
+        self._updated_at = 0.0
+        self._synced_at: Optional[float] = None
+        self._stale = True
+        self._charged_bytes = 0
+        self._charged_mana = 0.0
+
+    def _regenerated(self, now: float) -> float:
+        return _regenerate(self._mana, self.max_mana, now - self._updated_at)
+
+    def sync(self, rc_account: dict) -> None:
+        """Reset the model from an ``rc_api.find_rc_accounts`` entry."""
+        max_mana = int(rc_account["max_rc"])
+        mana = float(rc_account["rc_manabar"]["current_mana"])
+        updated_at = float(rc_account["rc_manabar"]["last_update_time"])
+
+        if self._charged_bytes:
+            # Compare what the chain charged for our broadcasts since the last
+            # sync with what we subtracted
+            now = time.time()
+            projected = self._regenerated(now) + self._charged_mana
+            actual = _regenerate(mana, max_mana, now - updated_at)
+            spent = projected - actual
+            if spent > 0:
+                observed = spent / self._charged_bytes
+                self.cost_per_byte += self.alpha * (observed - self.cost_per_byte)
+
+        self.max_mana = max_mana
+        self._mana = mana
+        self._updated_at = updated_at
+        self._synced_at = time.monotonic()
+        self._stale = False
+        self._charged_bytes = 0
+        self._charged_mana = 0.0
+
+    def charge(self, tx_size: int) -> None:
+        """Subtract the estimated cost of a broadcast transaction of ``tx_size`` bytes."""
+        if self._synced_at is None:
+            return
+        now = time.time()
+        cost = tx_size * self.cost_per_byte
+        self._mana = max(self._regenerated(now) - cost, 0.0)
+        self._updated_at = now
+        self._charged_bytes += tx_size
+        self._charged_mana += cost
+
+    def invalidate(self) -> None:
+        """Force a resync before the next estimate."""
+        self._stale = True
+
+    def needs_sync(self) -> bool:
+        if self._stale or self._synced_at is None:
+            return True
+        return time.monotonic() - self._synced_at > self.resync_interval
+
+    def mana(self) -> float:
+        return self._regenerated(time.time())
+
+    def percentage(self) -> float:
+        return self.mana() * 100 / self.max_mana if self.max_mana else 0.0
@@ -0,0 +1,95 @@
+"""Block arrival prediction for the watcher poll loop."""
+
+import time
+from typing import Optional
+
+# Hive produces a block every 3 seconds
+BLOCK_INTERVAL = 3.0
+
+
+class BlockScheduler:
+    """
+    Predict when the next block becomes available from observed head blocks.
+
+    The offset between the local clock and block timestamps (clock skew plus
+    propagation delay) is learned from polls: a block found on the first try
+    means polls can move earlier, by a step that doubles while that keeps
+    working, and a poll that misses moves them back. Polls that come back empty
+    back off exponentially, up to one block interval.
+    """
+
+    def __init__(
+        self,
+        block_interval: float = BLOCK_INTERVAL,
+        margin: float = 0.1,
+        retry_delay: float = 0.25,
+        max_misses: int = 5,
+    ) -> None:
+        self.block_interval = block_interval
+        self.margin = margin
+        self.retry_delay = retry_delay
+        self.max_misses = max_misses
+        self.misses = 0
+        self.head_block: Optional[int] = None
+        self._head_time: Optional[float] = None
+        self._offset: Optional[float] = None
+        self._step = 0.05
+
+    def observe(self, block_num: int, timestamp: float) -> bool:
+        """Record a head block and its Unix timestamp. Returns whether it is new."""
+        if self.head_block is not None and block_num <= self.head_block:
+            return False
+
+        lag = time.time() - timestamp
+        if self._offset is None or lag < self._offset:
+            self._offset = lag
+        elif self.misses:
+            # Polled too early; the block showed up somewhere before now
+            self._offset = min(lag, self._offset + self.retry_delay)
+            self._step = 0.05
+        else:
+            # Found on the first try, so it may have been available earlier
+            self._offset -= self._step
+            self._step = min(self._step * 2, self.block_interval / 4)
+        self.head_block = block_num
+        self._head_time = timestamp
+        self.misses = 0
+        return True
+
+    def miss(self) -> None:
+        """Record a poll that found no new block."""
+        self.misses += 1
+
+    def should_probe(self, block_num: int) -> bool:
+        """Whether to poll for ``block_num`` directly instead of asking for the head.
+
+        True when ``block_num`` is the next block after a recent head, i.e. the
+        watcher is keeping up with the chain.
+        """
+        expected = self.next_block_at()
+        return (
+            expected is not None
+            and self.head_block is not None
+            and block_num == self.head_block + 1
+            and self.misses < self.max_misses
+            and time.time() - expected < self.block_interval
+        )
+
+    def next_block_at(self) -> Optional[float]:
+        """Local Unix time when the block after the head should be available."""
+        if self._head_time is None or self._offset is None:
+            return None
+        return self._head_time + self.block_interval + self._offset + self.margin
+
+    def delay(self) -> float:
+        """Seconds to wait before checking for the next block."""
+        expected = self.next_block_at()
+        if expected is None:
+            return self.block_interval
+        remaining = expected - time.time()
+        if remaining > 0:
+            return remaining
+        if self.misses:
+            backoff = self.retry_delay * 2.0 ** (self.misses - 1)
+            return min(backoff, self.block_interval)
+        return 0.0
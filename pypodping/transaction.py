@@ -0,0 +1,139 @@
+"""Local Hive transaction serialization and signing."""
+
+import hashlib
+import struct
+from datetime import datetime, timezone
+from typing import List
+
+import ecdsa
+from lighthive.broadcast.key_objects import PrivateKey
+from lighthive.datastructures import Operation
+
+from .errors import PodpingAuthenticationError, PodpingError
+
+HIVE_CHAIN_ID = "beeab0de00000000000000000000000000000000000000000000000000000000"
+
+# Largest signed transaction a node will accept
+HIVE_MAX_TRANSACTION_SIZE = 64 * 1024
+
+# Most custom_json operations one account may have in a block
+HIVE_CUSTOM_OP_BLOCK_LIMIT = 5
+
+# Room left for the signature list appended to a serialized transaction
+SIGNATURE_SIZE = 1 + 65
+
+# Position of custom_json in Hive's operation list
+_CUSTOM_JSON_OPERATION_ID = 18
+
+_CURVE = ecdsa.SECP256k1
+
+
+def decode_private_key(wif: str) -> bytes:
+    """Return the raw 32-byte secret of a WIF-encoded private key."""
+    try:
+        return bytes(PrivateKey(wif))
+    except Exception as e:
+        raise PodpingAuthenticationError(f"Invalid posting key: {e}") from e
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _string(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return _varint(len(data)) + data
+
+
+def _account_set(accounts: List[str]) -> bytes:
+    return _varint(len(accounts)) + b"".join(_string(a) for a in sorted(accounts))
+
+
+def serialize_operation(operation: Operation) -> bytes:
+    if operation.type != "custom_json":
+        raise PodpingError(f"Unsupported operation: {operation.type}")
+
+    value = operation.op_value
+    return (
+        _varint(_CUSTOM_JSON_OPERATION_ID)
+        + _account_set(value.get("required_auths", []))
+        + _account_set(value.get("required_posting_auths", []))
+        + _string(value["id"])
+        + _string(value["json"])
+    )
+
+
+def serialize_transaction(
+    ref_block_num: int,
+    ref_block_prefix: int,
+    expiration: datetime,
+    operations: List[Operation],
+) -> bytes:
+    """Serialize an unsigned transaction in Hive's binary format."""
+    if expiration.tzinfo is None:
+        expiration = expiration.replace(tzinfo=timezone.utc)
+    return (
+        struct.pack(
+            "<HII", ref_block_num, ref_block_prefix, int(expiration.timestamp())
+        )
+        + _varint(len(operations))
+        + b"".join(serialize_operation(op) for op in operations)
+        + _varint(0)  # extensions
+    )
+
+
+def transaction_id(tx_bytes: bytes) -> str:
+    return hashlib.sha256(tx_bytes).digest()[:20].hex()
+
+
+def _is_canonical(signature: bytes) -> bool:
+    return (
+        not signature[0] & 0x80
+        and not (signature[0] == 0 and not signature[1] & 0x80)
+        and not signature[32] & 0x80
+        and not (signature[32] == 0 and not signature[33] & 0x80)
+    )
+
+
+def sign_digest(digest: bytes, secret: bytes) -> str:
+    """Return a canonical, recoverable secp256k1 signature of ``digest`` as hex."""
+    order: int = _CURVE.order
+    secexp = int.from_bytes(secret, "big")
+    e = int.from_bytes(digest, "big")
+
+    retry = 0
+    while True:
+        k = ecdsa.rfc6979.generate_k(order, secexp, hashlib.sha256, digest, retry)
+        retry += 1
+        point = _CURVE.generator * k
+        r: int = point.x() % order
+        s: int = ecdsa.numbertheory.inverse_mod(k, order) * (e + r * secexp) % order
+        if not r or not s:
+            continue
+
+        recovery_id = (point.y() & 1) | (2 if point.x() >= order else 0)
+        # Hive requires low-S signatures
+        if s > order // 2:
+            s = order - s
+            recovery_id ^= 1
+
+        signature = r.to_bytes(32, "big") + s.to_bytes(32, "big")
+        if _is_canonical(signature):
+            # 27 marks a recoverable signature, +4 a compressed public key
+            return (bytes([27 + 4 + recovery_id]) + signature).hex()
+
+
+def sign_transaction(
+    tx_bytes: bytes, secret: bytes, chain_id: str = HIVE_CHAIN_ID
+) -> str:
+    """Sign serialized transaction bytes for ``chain_id``."""
+    digest = hashlib.sha256(bytes.fromhex(chain_id) + tx_bytes).digest()
+    return sign_digest(digest, secret)
@@ -0,0 +1,197 @@
+"""Compact, normalized feed URL set for high-cardinality subscriptions."""
+
+import hashlib
+import re
+from array import array
+from typing import Iterable, Tuple
+from urllib.parse import quote, urlsplit, urlunsplit
+
+_UNRESERVED = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~"
+)
+_PERCENT_RE = re.compile(r"%([0-9A-Fa-f]{2})")
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]+")
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+# Reserved table slot values; real fingerprints are shifted above them
+_EMPTY = 0
+_DELETED = 1
+
+
+def _normalize_percent(text: str) -> str:
+    """Decode percent-escaped unreserved characters and upper-case the rest.
+
+    Non-ASCII characters are percent-encoded as UTF-8, so an IRI matches the
+    URI it maps to.
+    """
+
+    def repl(match: "re.Match[str]") -> str:
+        char = chr(int(match.group(1), 16))
+        return char if char in _UNRESERVED else "%" + match.group(1).upper()
+
+    text = _NON_ASCII_RE.sub(lambda match: quote(match.group(0), safe=""), text)
+    return _PERCENT_RE.sub(repl, text)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a feed URL for matching.
+
+    Lower-cases the scheme and host, drops default ports, fragments and trailing
+    slashes, and normalizes percent-encoding, percent-encoding non-ASCII path
+    and query characters as UTF-8. URLs that can't be parsed are
+    returned stripped but otherwise unchanged.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    userinfo, at, hostport = parts.netloc.rpartition("@")
+    hostport = hostport.lower()
+    host, colon, port = hostport.rpartition(":")
+    if colon and "]" not in port and _DEFAULT_PORTS.get(scheme) == port:
+        hostport = host
+
+    path = _normalize_percent(parts.path).rstrip("/")
+    query = _normalize_percent(parts.query)
+    return urlunsplit((scheme, userinfo + at + hostport, path, query, ""))
+
+
+def _fingerprint(url: str) -> int:
+    digest = hashlib.blake2b(normalize_url(url).encode("utf-8"), digest_size=8).digest()
+    return max(int.from_bytes(digest, "little"), _DELETED + 1)
+
+
+def _bloom_slots(bloom: bytearray, fp: int) -> Tuple[int, int, int]:
+    size = len(bloom)
+    return (fp % size, (fp >> 21) % size, (fp >> 42) % size)
+
+
+class UrlSet:
+    """
+    Set of feed URLs sized for millions of entries.
+
+    URLs are normalized with :func:`normalize_url` and stored as 64-bit
+    fingerprints in an open-addressing hash table backed by ``array("Q")``, about
+    16 bytes per URL instead of a Python string each. With millions of URLs the
+    chance of a fingerprint collision on a lookup is around one in 10^12.
+
+    With ``bloom=True`` a counting Bloom filter is checked before the table, so
+    most non-matching URLs are rejected without probing it. Adds and removes update
+    both structures in place.
+    """
+
+    def __init__(
+        self, urls: Iterable[str] = (), capacity: int = 1024, bloom: bool = False
+    ) -> None:
+        size = 8
+        while size < capacity * 2:
+            size *= 2
+        self._table = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+        self._used = 0  # live entries plus tombstones
+        self._bloom = bytearray(size * 2) if bloom else None
+        self.update(urls)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, url: object) -> bool:
+        if not isinstance(url, str):
+            return False
+        fp = _fingerprint(url)
+        if self._bloom is not None and not all(
+            self._bloom[i] for i in _bloom_slots(self._bloom, fp)
+        ):
+            return False
+        return self._find(fp) >= 0
+
+    def add(self, url: str) -> bool:
+        """Add ``url``. Returns ``False`` if it was already present."""
+        fp = _fingerprint(url)
+        if self._find(fp) >= 0:
+            return False
+
+        if (self._used + 1) * 2 > len(self._table):
+            self._resize()
+
+        slot = self._probe(fp)
+        if self._table[slot] == _EMPTY:
+            self._used += 1
+        self._table[slot] = fp
+        self._count += 1
+
+        if self._bloom is not None:
+            for i in _bloom_slots(self._bloom, fp):
+                if self._bloom[i] < 255:
+                    self._bloom[i] += 1
+        return True
+
+    def discard(self, url: str) -> bool:
+        """Remove ``url`` if present. Returns whether it was removed."""
+        fp = _fingerprint(url)
+        slot = self._find(fp)
+        if slot < 0:
+            return False
+
+        self._table[slot] = _DELETED
+        self._count -= 1
+
+        if self._bloom is not None:
+            for i in _bloom_slots(self._bloom, fp):
+                # Saturated counters can't be decremented safely
+                if self._bloom[i] < 255:
+                    self._bloom[i] -= 1
+        return True
+
+    def update(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.add(url)
+
+    def difference_update(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.discard(url)
+
+    def _find(self, fp: int) -> int:
+        table, mask = self._table, self._mask
+        slot = fp & mask
+        while True:
+            value = table[slot]
+            if value == fp:
+                return slot
+            if value == _EMPTY:
+                return -1
+            slot = (slot + 1) & mask
+
+    def _probe(self, fp: int) -> int:
+        """Return the first empty or deleted slot for ``fp``."""
+        table, mask = self._table, self._mask
+        slot = fp & mask
+        while table[slot] > _DELETED:
+            slot = (slot + 1) & mask
+        return slot
+
+    def _resize(self) -> None:
+        old = self._table
+        size = len(old)
+        # Grow only if live entries fill the table; otherwise just clear tombstones
+        if (self._count + 1) * 4 > size:
+            size *= 2
+        self._table = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self._used = self._count
+        for fp in old:
+            if fp > _DELETED:
+                self._table[self._probe(fp)] = fp
+
+        if self._bloom is not None and len(self._bloom) < size * 2:
+            self._bloom = bytearray(size * 2)
+            for fp in self._table:
+                if fp > _DELETED:
+                    for i in _bloom_slots(self._bloom, fp):
+                        if self._bloom[i] < 255:
+                            self._bloom[i] += 1
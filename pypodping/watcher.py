@@ -4,72 +4,504 @@ import asyncio
 import json
 import logging
 import re
-from datetime import datetime
-from typing import Callable, List, Optional
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Tuple
 
-from .client import HiveClient
-from .errors import PodpingError
+import aiohttp
+
+from .checkpoint import CheckpointStore
+from .client import BLOCK_RANGE_LIMIT, HEDGED_METHODS, HiveClient
+from .dispatcher import CallbackDispatcher
+from .errors import PodpingConnectionError, PodpingError, PodpingValidationError
+from .filters import FilterValues, PodpingFilter, SubscriptionIndex
+from .scheduler import BLOCK_INTERVAL, BlockScheduler
 from .types import PodpingData
+from .urlset import UrlSet
 
 logger = logging.getLogger(__name__)
 
+STREAM_OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+# Queued to every stream when the watcher stops
+_STREAM_END = object()
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Return ``value`` as an aware UTC datetime (naive values are taken as UTC)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class _UpdateStream:
+    """Bounded queue feeding a single :meth:`PodpingWatcher.stream` consumer.
+
+    An item counts as done once the consumer asks for the next one, so
+    ``queue.join()`` waits until everything queued so far has been handled.
+    """
+
+    def __init__(self, maxsize: int, overflow: str) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.overflow = overflow
+        self.dropped = 0
+        self.closed = False
+
+    def close(self) -> None:
+        """Detach the consumer, waking the watcher if it is blocked on a full queue."""
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+
+    async def put(self, item: object) -> None:
+        if self.closed:
+            return
+        if self.overflow == "block" or item is _STREAM_END:
+            await self.queue.put(item)
+            return
+
+        if self.queue.full():
+            self.dropped += 1
+            if self.overflow == "drop_newest":
+                return
+            self.queue.get_nowait()
+            self.queue.task_done()
+        self.queue.put_nowait(item)
+
 
 class PodpingWatcher:
     """Watch for podcast update notifications on the Hive blockchain."""
 
-    def __init__(self, nodes: Optional[List[str]] = None) -> None:
+    def __init__(
+        self,
+        nodes: Optional[List[str]] = None,
+        fetch_window: int = 8,
+        batch_size: int = 10,
+        range_threshold: int = 50,
+        range_size: int = 100,
+        checkpoint: Optional[CheckpointStore] = None,
+        checkpoint_every: int = 100,
+        checkpoint_interval: float = 30.0,
+        workers: int = 0,
+        max_pending: int = 1000,
+        ordered: bool = True,
+        ws_nodes: Optional[List[str]] = None,
+        connector: Optional[aiohttp.BaseConnector] = None,
+    ) -> None:
         self.nodes = nodes
+        self.connector = connector
+        self.fetch_window = max(1, fetch_window)
+        self.batch_size = max(1, batch_size)
+        self.range_threshold = range_threshold
+        self.range_size = max(1, min(range_size, BLOCK_RANGE_LIMIT))
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self._last_processed: Optional[int] = None
+        self._unsaved_blocks = 0
+        self._last_saved_at = 0.0
+        self._dispatcher: Optional[CallbackDispatcher] = None
+        if workers > 0:
+            self._dispatcher = CallbackDispatcher(workers, max_pending, ordered)
         self.running = False
         self.total_updates = 0
-        self._callback: Optional[Callable] = None
+        self._subscriptions = SubscriptionIndex()
+        self.url_set: Optional[UrlSet] = None
+        self.ws_nodes = ws_nodes or []
+        self._scheduler = BlockScheduler()
+        self._pushed_head: Optional[int] = None
+        # Created in start(), on the loop that runs the watcher
+        self._push_event: Optional[asyncio.Event] = None
+        self._probed: Optional[Tuple[int, dict]] = None
+        self._streams: List[_UpdateStream] = []
         self._operation_regex = re.compile(r"^pp_(.*)_(.*)|podping$")
 
-    def on_update(self, callback: Callable) -> Callable:
-        """Decorator to register a callback that receives :class:`PodpingData`."""
-        self._callback = callback
-        return callback
+    def on_update(
+        self,
+        callback: Optional[Callable] = None,
+        *,
+        medium: FilterValues = None,
+        reason: FilterValues = None,
+        accounts: FilterValues = None,
+        version: FilterValues = None,
+        hosts: FilterValues = None,
+        url_prefixes: FilterValues = None,
+    ) -> Callable:
+        """Decorator to register a callback that receives :class:`PodpingData`.
+
+        Any number of callbacks can be registered. Use ``@watcher.on_update`` to
+        receive everything, or pass filters to receive only matching updates, e.g.
+        ``@watcher.on_update(medium="music", hosts=["feeds.example.com"])``. Each
+        filter takes a string or a list of strings. With ``hosts`` or
+        ``url_prefixes`` the callback only receives the URLs that match.
+        """
+        flt = PodpingFilter.create(medium, reason, accounts, version, hosts, url_prefixes)
+
+        def register(cb: Callable) -> Callable:
+            self._subscriptions.add(cb, flt)
+            return cb
 
-    async def start(self) -> None:
-        """Start watching for podcast updates. Runs until stopped."""
+        return register(callback) if callback else register
+
+    def remove_handler(self, callback: Callable) -> None:
+        """Unregister a callback added with :meth:`on_update`."""
+        self._subscriptions.remove(callback)
+
+    def watch_urls(self, urls: Iterable[str]) -> None:
+        """Only deliver updates for these feed URLs (can be called repeatedly to add more).
+
+        URLs are normalized before matching, and non-watched URLs are removed from
+        each update before any handler sees it. For very large sets, assign a
+        pre-sized ``watcher.url_set = UrlSet(capacity=..., bloom=True)`` first.
+        """
+        if self.url_set is None:
+            self.url_set = UrlSet()
+        self.url_set.update(urls)
+
+    def unwatch_urls(self, urls: Iterable[str]) -> None:
+        """Stop delivering updates for these feed URLs."""
+        if self.url_set is not None:
+            self.url_set.difference_update(urls)
+
+    async def stream(
+        self,
+        maxsize: int = 1000,
+        overflow: str = "block",
+        **filters: FilterValues,
+    ) -> AsyncIterator[PodpingData]:
+        """Iterate over updates as they arrive: ``async for data in watcher.stream():``.
+
+        Updates are buffered in a queue of ``maxsize`` items. When it is full,
+        ``overflow`` decides what happens: ``"block"`` pauses block ingestion until
+        the consumer catches up, ``"drop_oldest"`` discards the oldest queued update
+        and ``"drop_newest"`` discards the incoming one. The iterator ends when the
+        watcher stops. Keyword arguments filter updates as in :meth:`on_update`.
+
+        With ``"block"``, checkpoints wait until the consumer has finished with
+        every update queued so far (it asks for the next one), so a restart
+        delivers them again: at-least-once, like callbacks. The dropping
+        policies are at-most-once and never hold back a checkpoint.
+        """
+        if overflow not in STREAM_OVERFLOW_POLICIES:
+            raise PodpingValidationError(f"Invalid overflow policy: {overflow}")
+
+        stream = _UpdateStream(maxsize, overflow)
+        self._subscriptions.add(stream, PodpingFilter.create(**filters))
+        self._streams.append(stream)
+        try:
+            while True:
+                item = await stream.queue.get()
+                try:
+                    if item is _STREAM_END:
+                        return
+                    yield item
+                finally:
+                    stream.queue.task_done()
+        finally:
+            self._subscriptions.remove(stream)
+            self._streams.remove(stream)
+            stream.close()
+            if stream.dropped:
+                logger.warning(f"Stream dropped {stream.dropped} updates")
+
+    async def start(
+        self,
+        from_block: Optional[int] = None,
+        from_time: Optional[datetime] = None,
+        until_block: Optional[int] = None,
+    ) -> None:
+        """Start watching for podcast updates. Runs until stopped.
+
+        By default watching resumes after the block saved in ``checkpoint``, or
+        starts at the current head block. Pass ``from_block`` or ``from_time`` to
+        replay history from an earlier point, and ``until_block`` to stop once that
+        block has been processed.
+        """
         if self.running:
             raise PodpingError("Watcher is already running")
+        if from_block is not None and from_time is not None:
+            raise PodpingValidationError("Pass either from_block or from_time, not both")
 
         self.running = True
+        self._push_event = asyncio.Event()
 
-        async with HiveClient(self.nodes) as client:
+        async with HiveClient(
+            self.nodes,
+            hedge=HEDGED_METHODS,
+            connector=self.connector,
+            head_checks=True,
+        ) as client:
+            push_task = None
             try:
+                if self._dispatcher:
+                    await self._dispatcher.start()
+                if self.ws_nodes:
+                    push_task = asyncio.ensure_future(self._follow_pushed_blocks(client))
+
                 # Determine starting block
                 props = await client.get_dynamic_global_properties()
                 current_block = props["head_block_number"]
+                if from_block is not None:
+                    current_block = from_block
+                elif from_time is not None:
+                    current_block = await self._find_block_at(
+                        client, from_time, current_block
+                    )
+                elif self.checkpoint:
+                    last_block = self.checkpoint.load()
+                    if last_block is not None:
+                        current_block = last_block + 1
+                        logger.info(f"Resuming from checkpoint at block {current_block}")
+
+                self._last_saved_at = time.monotonic()
 
                 while self.running:
-                    props = await client.get_dynamic_global_properties()
-                    head_block = props["head_block_number"]
+                    head_block = await self._get_head_block(client, current_block)
+                    if until_block is not None:
+                        head_block = min(head_block, until_block)
+
+                    # Process all available blocks, fetching ahead concurrently
+                    stalled = False
+                    async for block_num, block in self._fetch_blocks(
+                        client, current_block, head_block
+                    ):
+                        if block is None:
+                            # Never skip a block: retry it on the next pass
+                            logger.warning(f"Block {block_num} unavailable, retrying")
+                            stalled = True
+                            break
 
-                    # Process all available blocks
-                    while current_block <= head_block and self.running:
-                        updates = await self._process_block(client, current_block)
+                        updates = await self._process_block(block_num, block)
                         self.total_updates += updates
-                        current_block += 1
+                        current_block = block_num + 1
+                        await self._block_done(block_num)
 
-                    await asyncio.sleep(3)
+                    if until_block is not None and current_block > until_block:
+                        break
+
+                    if stalled:
+                        await asyncio.sleep(BLOCK_INTERVAL)
+                        continue
+
+                    await self._wait_for_block(current_block)
 
             finally:
                 self.running = False
+                if push_task:
+                    push_task.cancel()
+                try:
+                    if self._dispatcher:
+                        await self._dispatcher.close()
+                    await self._save_checkpoint()
+                except Exception as e:
+                    logger.warning(f"Failed to save checkpoint: {e}")
+                for stream in list(self._streams):
+                    await stream.put(_STREAM_END)
+
+    async def _get_head_block(self, client: HiveClient, next_block: int) -> int:
+        """Return the head block, from push notifications when available.
+
+        While keeping up with the chain, ``next_block`` is fetched directly instead
+        of asking for the head, and kept for :meth:`_fetch_chunk` to reuse.
+        """
+        if self._pushed_head is not None:
+            return self._pushed_head
+
+        if self._scheduler.should_probe(next_block):
+            try:
+                block = await client.get_block(next_block)
+            except Exception as e:
+                logger.debug(f"Failed to fetch block {next_block}: {e}")
+                block = None
+            if not block:
+                self._scheduler.miss()
+                return next_block - 1
+
+            timestamp = _as_utc(_parse_timestamp(block["timestamp"])).timestamp()
+            self._scheduler.observe(next_block, timestamp)
+            self._probed = (next_block, block)
+            return next_block
+
+        props = await client.get_dynamic_global_properties()
+        head_block: int = props["head_block_number"]
+        timestamp = _as_utc(_parse_timestamp(props["time"])).timestamp()
+        if not self._scheduler.observe(head_block, timestamp):
+            self._scheduler.miss()
+        return head_block
+
+    async def _wait_for_block(self, block_num: int) -> None:
+        """Wait until ``block_num`` has been pushed or is expected to be available."""
+        if self._pushed_head is None or self._push_event is None:
+            await asyncio.sleep(self._scheduler.delay())
+            return
+
+        self._push_event.clear()
+        if self._pushed_head >= block_num:
+            return
+        try:
+            await asyncio.wait_for(
+                self._push_event.wait(), self._scheduler.delay() + BLOCK_INTERVAL
+            )
+        except asyncio.TimeoutError:
+            # Push feed went quiet, poll until it delivers again
+            self._pushed_head = None
+
+    async def _follow_pushed_blocks(self, client: HiveClient) -> None:
+        """Track the head block from WebSocket push notifications on ``ws_nodes``."""
+        retry_delay = 1.0
+        while self.running:
+            for url in self.ws_nodes:
+                try:
+                    async for header in client.subscribe_blocks(url):
+                        block_num = header["block_num"]
+                        timestamp = _as_utc(_parse_timestamp(header["timestamp"]))
+                        self._scheduler.observe(block_num, timestamp.timestamp())
+                        if self._pushed_head is None or block_num > self._pushed_head:
+                            self._pushed_head = block_num
+                        if self._push_event is not None:
+                            self._push_event.set()
+                        retry_delay = 1.0
+                except PodpingConnectionError as e:
+                    logger.debug(str(e))
+                self._pushed_head = None
+
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 60.0)
+
+    async def _block_done(self, block_num: int) -> None:
+        """Record a fully processed block and save a checkpoint when one is due."""
+        self._last_processed = block_num
+        self._unsaved_blocks += 1
+        if (
+            self._unsaved_blocks >= self.checkpoint_every
+            or time.monotonic() - self._last_saved_at >= self.checkpoint_interval
+        ):
+            await self._save_checkpoint()
+
+    async def _save_checkpoint(self) -> None:
+        if not self.checkpoint or self._last_processed is None or not self._unsaved_blocks:
+            return
+        # Only checkpoint blocks whose callbacks and streams have all finished
+        if self._dispatcher:
+            await self._dispatcher.join()
+        for stream in list(self._streams):
+            if stream.overflow == "block":
+                await stream.queue.join()
+        self.checkpoint.save(self._last_processed)
+        self._unsaved_blocks = 0
+        self._last_saved_at = time.monotonic()
+
+    async def _find_block_at(
+        self, client: HiveClient, when: datetime, head_block: int
+    ) -> int:
+        """Binary search block headers for the first block produced at or after ``when``."""
+        when = _as_utc(when)
+        low, high = 1, head_block
+        while low < high:
+            mid = (low + high) // 2
+            header = await client.get_block_header(mid)
+            if _as_utc(_parse_timestamp(header["timestamp"])) < when:
+                low = mid + 1
+            else:
+                high = mid
+        return low
 
     def stop(self) -> None:
         """Stop the watcher."""
         self.running = False
 
-    async def _process_block(self, client: HiveClient, block_num: int) -> int:
-        """Process a block and return number of updates found."""
+    async def _fetch_chunk(
+        self, client: HiveClient, start: int, count: int, use_range: bool = False
+    ) -> List[Optional[dict]]:
+        if self._probed and self._probed[0] == start and count == 1:
+            block, self._probed = self._probed[1], None
+            return [block]
+
+        blocks: List[Optional[dict]]
+        try:
+            if use_range:
+                blocks = await client.get_block_range(start, count)
+            elif count == 1:
+                blocks = [await client.get_block(start)]
+            else:
+                blocks = await client.get_blocks(range(start, start + count))
+        except Exception as e:
+            logger.debug(f"Failed to fetch blocks {start}-{start + count - 1}: {e}")
+            blocks = [None] * count
+
+        # These blocks are at or below the head, so a missing one means a lagging
+        # or failing node: ask the other nodes for it
+        for offset, fetched in enumerate(blocks):
+            if fetched is None:
+                try:
+                    blocks[offset] = await client.get_block(start + offset, required=True)
+                except Exception as e:
+                    logger.debug(f"Failed to fetch block {start + offset}: {e}")
+        return blocks
+
+    async def _fetch_blocks(
+        self, client: HiveClient, start: int, end: int
+    ) -> AsyncIterator[Tuple[int, Optional[dict]]]:
+        """Yield ``(block_num, block)`` for ``start..end`` in block order.
+
+        Blocks are requested in batches of ``batch_size``, with up to
+        ``fetch_window`` batches in flight at once. While more than
+        ``range_threshold`` blocks remain, ``block_api.get_block_range`` is used
+        to fetch ``range_size`` blocks per request instead.
+        """
+        pending: deque = deque()
+        next_block = start
+        try:
+            while self.running and (pending or next_block <= end):
+                while next_block <= end and len(pending) < self.fetch_window:
+                    remaining = end - next_block + 1
+                    use_range = remaining > self.range_threshold
+                    size = self.range_size if use_range else self.batch_size
+                    count = min(size, remaining)
+                    task = asyncio.ensure_future(
+                        self._fetch_chunk(client, next_block, count, use_range)
+                    )
+                    pending.append((next_block, task))
+                    next_block += count
+
+                first, task = pending.popleft()
+                for offset, block in enumerate(await task):
+                    if not self.running:
+                        return
+                    yield first + offset, block
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def _emit(self, podping_data: PodpingData) -> bool:
+        """Hand an update to every matching handler. Returns whether anyone got it."""
+        matches = self._subscriptions.match(podping_data)
+        for handler, data in matches:
+            if isinstance(handler, _UpdateStream):
+                await handler.put(data)
+            elif self._dispatcher:
+                await self._dispatcher.submit(handler, data)
+            elif asyncio.iscoroutinefunction(handler):
+                await handler(data)
+            else:
+                handler(data)
+
+        return bool(matches)
+
+    async def _process_block(self, block_num: int, block: Optional[dict]) -> int:
+        """Process a fetched block and return number of updates found."""
         try:
-            block = await client.get_block(block_num)
             if not block:
                 return 0
 
             updates = 0
-            timestamp = datetime.fromisoformat(block["timestamp"].replace("Z", "+00:00"))
+            timestamp = _parse_timestamp(block["timestamp"])
             tx_ids = block.get("transaction_ids", [])
 
             for tx_idx, tx in enumerate(block.get("transactions", [])):
@@ -88,6 +520,9 @@ class PodpingWatcher:
                         if isinstance(urls, str):
                             urls = [urls]
 
+                        if self.url_set is not None:
+                            urls = [url for url in urls if url in self.url_set]
+
                         if not urls:
                             continue
 
@@ -102,12 +537,7 @@ class PodpingWatcher:
                             version=data.get("version", "1.0"),
                         )
 
-                        if self._callback:
-                            if asyncio.iscoroutinefunction(self._callback):
-                                await self._callback(podping_data)
-                            else:
-                                self._callback(podping_data)
-
+                        if await self._emit(podping_data):
                             updates += len(urls)
                     except Exception as e:
                         logger.debug(f"Failed to parse update: {e}")
@@ -1,19 +1,162 @@
 """PodPing writer for sending podcast update notifications."""
 
+import asyncio
 import json
 import logging
+import time
 import uuid
 from datetime import datetime, timezone
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+import aiohttp
 import rfc3987
 from lighthive.datastructures import Operation
 
 from .client import HiveWriter
-from .errors import PodpingError, PodpingValidationError
+from .confirm import BlockFollower
+from .errors import PodpingBatchError, PodpingError, PodpingValidationError
+from .ratelimit import RateLimiter
+from .transaction import (
+    HIVE_CUSTOM_OP_BLOCK_LIMIT,
+    HIVE_MAX_TRANSACTION_SIZE,
+    SIGNATURE_SIZE,
+    serialize_operation,
+)
 
 logger = logging.getLogger(__name__)
 
+# Maximum size of a podping custom_json payload
+MAX_PAYLOAD_SIZE = 8192
+
+# Largest session id, for sizing payloads that any writer might send
+_WIDEST_SESSION_ID = (1 << 64) - 1
+
+
+def _validate_urls(url_list: List[str]) -> None:
+    for url in url_list:
+        if not rfc3987.match(url.replace(" ", "%20"), "IRI"):
+            raise PodpingValidationError(f"Invalid URL: {url}")
+
+
+class _PayloadSize:
+    """Serialized size of a payload, updated incrementally as URLs are added."""
+
+    def __init__(self, medium: str, reason: str, session_id: int) -> None:
+        # A 19-digit timestamp is as wide as timestampNs gets before the year 2286
+        empty = {
+            "version": "1.1",
+            "medium": medium,
+            "reason": reason,
+            "iris": [],
+            "timestampNs": 10**18,
+            "sessionId": session_id,
+        }
+        self.size = len(json.dumps(empty, separators=(",", ":")))
+        self.count = 0
+
+    @staticmethod
+    def url_size(url: str) -> int:
+        return len(json.dumps(url))
+
+    def fits(self, url_size: int) -> bool:
+        return self.size + url_size + (1 if self.count else 0) <= MAX_PAYLOAD_SIZE
+
+    def add(self, url_size: int) -> None:
+        self.size += url_size + (1 if self.count else 0)
+        self.count += 1
+
+
+def _pack_urls(
+    url_list: List[str], medium: str, reason: str, session_id: int
+) -> List[List[str]]:
+    """Split URLs into as few payloads as fit, using first-fit decreasing."""
+    sized = sorted(
+        ((_PayloadSize.url_size(url), url) for url in dict.fromkeys(url_list)),
+        key=lambda item: item[0],
+        reverse=True,
+    )
+    bins: List[Tuple[_PayloadSize, List[str]]] = []
+    for url_size, url in sized:
+        for size, urls in bins:
+            if size.fits(url_size):
+                break
+        else:
+            size, urls = _PayloadSize(medium, reason, session_id), []
+            if not size.fits(url_size):
+                raise PodpingValidationError(f"URL too long for a single payload: {url}")
+            bins.append((size, urls))
+        size.add(url_size)
+        urls.append(url)
+    return [urls for _, urls in bins]
+
+
+def _pack_operations(operations: List[Operation]) -> List[Tuple[List[Operation], int]]:
+    """Group operations, in order, into chunks that each fit one transaction.
+
+    Returns each chunk with its approximate signed transaction size.
+    """
+    # Transaction header, operation count and extensions
+    overhead = 16 + SIGNATURE_SIZE
+    chunks: List[Tuple[List[Operation], int]] = []
+    for op in operations:
+        op_size = len(serialize_operation(op))
+        if (
+            not chunks
+            or len(chunks[-1][0]) >= HIVE_CUSTOM_OP_BLOCK_LIMIT
+            or chunks[-1][1] + op_size > HIVE_MAX_TRANSACTION_SIZE
+        ):
+            chunks.append(([], overhead))
+        chunk, size = chunks[-1]
+        chunk.append(op)
+        chunks[-1] = (chunk, size + op_size)
+    return chunks
+
+
+def _chain(sources: List[asyncio.Future], target: asyncio.Future) -> None:
+    """Settle ``target`` like the first of ``sources`` to fail, or with the result
+    of the last to succeed once they all have."""
+    waiting = len(sources)
+
+    def copy(future: asyncio.Future) -> None:
+        nonlocal waiting
+        waiting -= 1
+        if target.done():
+            return
+        if future.cancelled():
+            target.cancel()
+            return
+        error = future.exception()
+        if error is not None:
+            target.set_exception(error)
+        elif not waiting:
+            target.set_result(future.result())
+
+    for source in sources:
+        source.add_done_callback(copy)
+
+
+def _raise_failures(results: List[Union[dict, Exception]]) -> None:
+    """Raise :class:`PodpingBatchError` carrying ``results`` if any of them failed."""
+    failures = [result for result in results if isinstance(result, Exception)]
+    if failures:
+        raise PodpingBatchError(
+            f"{len(failures)} of {len(results)} notifications failed: {failures[0]}",
+            results,
+        ) from failures[0]
+
+
+def _log_lost(outcome: asyncio.Future) -> None:
+    if not outcome.cancelled() and outcome.exception() is not None:
+        logger.warning(f"Podping was not included: {outcome.exception()}")
+
+
+class _PendingGroup:
+    """URLs queued for one (medium, reason) payload, each with its waiting futures."""
+
+    def __init__(self, medium: str, reason: str, session_id: int) -> None:
+        self.urls: Dict[str, List[asyncio.Future]] = {}
+        self.size = _PayloadSize(medium, reason, session_id)
+
 
 class PodpingWriter:
     """Send podcast update notifications to the Hive blockchain."""
@@ -24,33 +167,233 @@ class PodpingWriter:
         posting_key: str,
         nodes: Optional[List[str]] = None,
         dry_run: bool = False,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        flush_interval: float = 3.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        block_follower: Optional[BlockFollower] = None,
+        rebroadcast: bool = False,
+        max_rebroadcasts: int = 3,
     ):
         self.account = account
         self.dry_run = dry_run
+        self.flush_interval = flush_interval
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.block_follower = block_follower
+        self.rebroadcast = rebroadcast
+        self.max_rebroadcasts = max_rebroadcasts
+        self._owns_follower = False
+        # The latest transaction tracked for rebroadcast carrying each
+        # (medium, reason, url), and the outcomes of later transactions
+        # carrying URLs of an earlier one
+        self._latest: Dict[Tuple[str, str, str], str] = {}
+        self._covered: Dict[str, List[asyncio.Future]] = {}
+        self._rebroadcasts: set = set()
+        self._connector = connector
         self.session_id = uuid.uuid4().int & ((1 << 64) - 1)
         self._hive_writer = HiveWriter(
-            account=account, posting_key=posting_key, nodes=nodes
+            account=account, posting_key=posting_key, nodes=nodes, connector=connector
         )
+        self._pending: Dict[Tuple[str, str], _PendingGroup] = {}
+        # Full payloads waiting to share a transaction
+        self._full: List[Tuple[Tuple[str, str], _PendingGroup]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flushes: set = set()
+
+    async def __aenter__(self) -> "PodpingWriter":
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Post anything still queued by :meth:`enqueue`, then close the Hive connection."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+        for task in self._rebroadcasts:
+            task.cancel()
+        if self._owns_follower and self.block_follower is not None:
+            await self.block_follower.close()
+        await self._hive_writer.close()
+
+    @property
+    def queue_delay(self) -> float:
+        """Seconds a new post would currently wait for the rate limiter."""
+        return self.rate_limiter.delay(self.account)
+
+    def enqueue(
+        self, url: str, reason: str = "update", medium: str = "podcast"
+    ) -> asyncio.Future:
+        """Queue a feed URL to be posted with others in the next batch.
+
+        Queued URLs are deduplicated and grouped by ``(medium, reason)``. Each
+        group is posted every ``flush_interval`` seconds, or as soon as enough
+        payloads fill up to make a full transaction. Returns a future that
+        resolves to the transaction id.
+        """
+        _validate_urls([url])
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_loop())
+
+        future = asyncio.get_running_loop().create_future()
+        key = (medium, reason)
+        group = self._pending.get(key)
+        queued = self._full + ([(key, group)] if group else [])
+        for queued_key, queued_group in queued:
+            if queued_key == key and url in queued_group.urls:
+                queued_group.urls[url].append(future)
+                return future
+
+        url_size = _PayloadSize.url_size(url)
+        if group and not group.size.fits(url_size):
+            self._full.append((key, self._pending.pop(key)))
+            if len(self._full) >= HIVE_CUSTOM_OP_BLOCK_LIMIT:
+                self._start_flush(self._full)
+                self._full = []
+            group = None
+        if group is None:
+            group = self._pending[key] = _PendingGroup(medium, reason, self.session_id)
+
+        group.size.add(url_size)
+        group.urls[url] = [future]
+        return future
+
+    async def flush(self) -> None:
+        """Post every queued URL now and wait for the results."""
+        self._flush_queued()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _flush_queued(self) -> None:
+        self._start_flush(self._full + list(self._pending.items()))
+        self._full = []
+        self._pending = {}
+
+    def _start_flush(self, groups: List[Tuple[Tuple[str, str], _PendingGroup]]) -> None:
+        if not groups:
+            return
+        task = asyncio.ensure_future(self._post_groups(groups))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self._flush_queued()
+
+    async def _post_groups(self, groups: List[Tuple[Tuple[str, str], _PendingGroup]]) -> None:
+        # Every group fits one payload, so results line up with groups
+        notifications = [(list(group.urls), reason, medium) for (medium, reason), group in groups]
+        try:
+            results = await self.post_batch(notifications, return_exceptions=True)
+        except Exception as e:
+            results = [e] * len(groups)
+
+        for (_, group), result in zip(groups, results):
+            for futures in group.urls.values():
+                for future in futures:
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result["tx_id"])
 
     async def post(
         self,
         urls: Union[str, List[str]],
         reason: str = "update",
         medium: str = "podcast",
-    ) -> dict:
+        confirm: bool = False,
+    ) -> Union[dict, asyncio.Future]:
         """Post update notification for one or more feed URLs.
 
-        Returns ``{"tx_id": "..."}``.
+        Returns ``{"tx_id": "..."}``. With ``confirm=True``, returns a future
+        instead, resolving to ``{"tx_id", "block_num", "latency"}`` once the
+        transaction is in a block. With ``rebroadcast`` on, that is the
+        transaction which finally carried the URLs, once it is irreversible.
         """
         url_list = [urls] if isinstance(urls, str) else list(urls)
-        for url in url_list:
-            if not rfc3987.match(url.replace(" ", "%20"), "IRI"):
-                raise PodpingValidationError(f"Invalid URL: {url}")
+        _validate_urls(url_list)
+        (response,) = await self._broadcast([(url_list, reason, medium)])
+        if isinstance(response, Exception):
+            raise response
+        tx_id = response["id"]
+        if not confirm:
+            return {"tx_id": tx_id}
 
         if self.dry_run:
-            logger.info(f"DRY RUN - Would post notification for {len(url_list)} URLs")
-            return {"tx_id": "dry_run"}
+            future = asyncio.get_running_loop().create_future()
+            future.set_result({"tx_id": tx_id, "block_num": None, "latency": 0.0})
+            return future
+        if self.rebroadcast:
+            outcome: asyncio.Future = response["outcome"]
+            return outcome
+        return self._follower().track(
+            tx_id, response["expiration"], after_block=response["ref_block"]
+        )
+
+    async def post_many(
+        self,
+        urls: List[str],
+        reason: str = "update",
+        medium: str = "podcast",
+    ) -> List[dict]:
+        """Post any number of feed URLs, split across as few payloads as fit.
+
+        Duplicate URLs are dropped. Returns one ``{"tx_id": ..., "urls": [...]}``
+        per payload; payloads share transactions where the size rules allow.
+        """
+        results = await self.post_batch([(urls, reason, medium)])
+        # Failures were raised, so every result is a dict
+        return [
+            {"tx_id": r["tx_id"], "urls": r["urls"]}
+            for r in results
+            if isinstance(r, dict)
+        ]
+
+    async def post_batch(
+        self,
+        notifications: Sequence[Tuple[Union[str, List[str]], str, str]],
+        return_exceptions: bool = False,
+    ) -> List[Union[dict, Exception]]:
+        """Post several ``(urls, reason, medium)`` notifications together.
+
+        Each notification becomes one or more custom_json operations, and the
+        operations are packed into as few transactions as Hive allows. Returns a
+        ``{"tx_id", "medium", "reason", "urls"}`` dict per operation. With
+        ``return_exceptions``, operations whose transaction failed get the
+        exception in their place. Otherwise every transaction is still attempted,
+        then :class:`PodpingBatchError` is raised with all the results.
+        """
+        payloads = []
+        for urls, reason, medium in notifications:
+            url_list = [urls] if isinstance(urls, str) else list(urls)
+            _validate_urls(url_list)
+            for chunk in _pack_urls(url_list, medium, reason, self.session_id):
+                payloads.append((chunk, reason, medium))
 
+        responses = await self._broadcast(payloads)
+        results: List[Union[dict, Exception]] = []
+        for (chunk, reason, medium), response in zip(payloads, responses):
+            if isinstance(response, Exception):
+                results.append(response)
+            else:
+                results.append(
+                    {
+                        "tx_id": response["id"],
+                        "medium": medium,
+                        "reason": reason,
+                        "urls": chunk,
+                    }
+                )
+        if not return_exceptions:
+            _raise_failures(results)
+        return results
+
+    def _operation(self, url_list: List[str], reason: str, medium: str) -> Operation:
         # Build notification payload
         payload = {
             "version": "1.1",
@@ -62,11 +405,10 @@ class PodpingWriter:
         }
 
         json_str = json.dumps(payload, separators=(",", ":"))
-        if len(json_str.encode("utf-8")) > 8192:
+        if len(json_str.encode("utf-8")) > MAX_PAYLOAD_SIZE:
             raise PodpingValidationError("Too many URLs (payload exceeds 8KB limit)")
 
-        # Create blockchain operation
-        operation = Operation(
+        return Operation(
             "custom_json",
             {
                 "required_auths": [],
@@ -76,16 +418,347 @@ class PodpingWriter:
             },
         )
 
-        # Send to blockchain
+    async def _broadcast(
+        self, payloads: List[Tuple[List[str], str, str]]
+    ) -> List[Union[dict, Exception]]:
+        """Broadcast ``(urls, reason, medium)`` payloads in as few transactions as fit.
+
+        Returns the :meth:`HiveWriter.broadcast_operations` response for each
+        payload's transaction, or the error if it failed. With ``rebroadcast``
+        on, it also carries the ``outcome`` future from :meth:`_track`.
+        """
+        responses: List[Union[dict, Exception]] = []
+        chunks = _pack_operations([self._operation(*payload) for payload in payloads])
+        if self.dry_run:
+            for chunk, _ in chunks:
+                logger.info(f"DRY RUN - Would post {len(chunk)} notification operations")
+                responses.extend([{"id": "dry_run", "expiration": None}] * len(chunk))
+            return responses
+
+        # Reserve every slot up front, before the first await, so concurrent
+        # callers are served in order
+        start = time.monotonic()
+        waits = [
+            self.rate_limiter.reserve(self.account, len(chunk), size)
+            for chunk, size in chunks
+        ]
+        for (chunk, _), wait in zip(chunks, waits):
+            delay = start + wait - time.monotonic()
+            if delay > 0:
+                logger.debug(f"Rate limited, waiting {delay:.2f}s to broadcast")
+                await asyncio.sleep(delay)
+
+            try:
+                response = await self._hive_writer.broadcast_operations(chunk)
+                logger.info(f"Posted {len(chunk)} notification operations: {response['id']}")
+                if self.rebroadcast:
+                    chunk_payloads = payloads[len(responses) : len(responses) + len(chunk)]
+                    response["outcome"] = self._track(response, chunk_payloads)
+                responses.extend([response] * len(chunk))
+            except Exception as e:
+                # Later chunks already hold rate limiter slots, so go on with them
+                error = PodpingError(f"Failed to post notification: {e}")
+                error.__cause__ = e
+                responses.extend([error] * len(chunk))
+        return responses
+
+    def _follower(self) -> BlockFollower:
+        if self.block_follower is None:
+            self.block_follower = BlockFollower(self._hive_writer.nodes, self._connector)
+            self._owns_follower = True
+        return self.block_follower
+
+    def _track(
+        self,
+        response: dict,
+        payloads: List[Tuple[List[str], str, str]],
+        attempt: int = 0,
+        outcome: Optional[asyncio.Future] = None,
+    ) -> asyncio.Future:
+        """Follow a broadcast transaction until it is irreversible, rebroadcasting
+        it if it expires first.
+
+        Returns a future for the confirmation of whichever transaction ends up
+        carrying the payloads.
+        """
+        if outcome is None:
+            outcome = asyncio.get_running_loop().create_future()
+            outcome.add_done_callback(_log_lost)
+        tx_id = response["id"]
+        for urls, reason, medium in payloads:
+            for url in urls:
+                previous = self._latest.get((medium, reason, url))
+                if previous is not None and previous != tx_id:
+                    covering = self._covered.setdefault(previous, [])
+                    if outcome not in covering:
+                        covering.append(outcome)
+                self._latest[(medium, reason, url)] = tx_id
+
+        confirmation = self._follower().track(
+            tx_id,
+            response["expiration"],
+            irreversible=True,
+            after_block=response["ref_block"],
+        )
+        confirmation.add_done_callback(
+            lambda f: self._settle(f, response, payloads, attempt, outcome)
+        )
+        return outcome
+
+    def _settle(
+        self,
+        confirmation: asyncio.Future,
+        response: dict,
+        payloads: List[Tuple[List[str], str, str]],
+        attempt: int,
+        outcome: asyncio.Future,
+    ) -> None:
+        tx_id = response["id"]
+        # Kept even if the later transaction has settled already
+        covered_by = [f for f in self._covered.pop(tx_id, []) if f is not outcome]
+
+        # Keep only URLs no later transaction carries
+        remaining = []
+        for urls, reason, medium in payloads:
+            kept = []
+            for url in urls:
+                if self._latest.get((medium, reason, url)) == tx_id:
+                    del self._latest[(medium, reason, url)]
+                    kept.append(url)
+            if kept:
+                remaining.append((kept, reason, medium))
+
+        if outcome.done():
+            return
+        if confirmation.cancelled():
+            outcome.cancel()
+            return
+
+        error = confirmation.exception()
+        if error is None:
+            outcome.set_result(confirmation.result())
+        elif remaining:
+            task = asyncio.ensure_future(
+                self._rebroadcast(response, remaining, attempt + 1, outcome)
+            )
+            self._rebroadcasts.add(task)
+            task.add_done_callback(self._rebroadcasts.discard)
+        elif covered_by:
+            # Every URL went out again in later posts; follow those instead
+            _chain(covered_by, outcome)
+        else:
+            outcome.set_exception(error)
+
+    async def _rebroadcast(
+        self,
+        response: dict,
+        payloads: List[Tuple[List[str], str, str]],
+        attempt: int,
+        outcome: asyncio.Future,
+    ) -> None:
+        if attempt > self.max_rebroadcasts:
+            outcome.set_exception(
+                PodpingError(f"Transaction not included after {attempt} broadcasts")
+            )
+            return
+
+        logger.info(f"Transaction {response['id']} expired, rebroadcasting")
         try:
-            response = await self._hive_writer.broadcast_operation(operation)
-            logger.info(f"Posted notification for {len(url_list)} URLs: {response['id']}")
-            return {
-                "tx_id": response["id"],
-            }
+            # The expired transaction's payloads fit one transaction, so these do too
+            [(operations, size)] = _pack_operations(
+                [self._operation(*payload) for payload in payloads]
+            )
+            await self.rate_limiter.acquire(self.account, len(operations), size)
+            new_response = await self._hive_writer.broadcast_operations(
+                operations, avoid=[response["node"]]
+            )
         except Exception as e:
-            raise PodpingError(f"Failed to post notification: {e}") from e
+            if not outcome.done():
+                outcome.set_exception(PodpingError(f"Failed to rebroadcast: {e}"))
+            return
+        self._track(new_response, payloads, attempt, outcome)
 
     async def get_credits(self) -> float:
         """Return remaining Resource Credits as a percentage (0.0–100.0)."""
         return await self._hive_writer.get_account_rc()
+
+
+class PodpingWriterPool:
+    """Spread podping posts across several Hive accounts.
+
+    Each transaction goes to the account whose rate limiter slot comes up
+    soonest, and among those to the one with the most Resource Credits. Accounts
+    below ``min_credits`` percent are skipped while any other account is above
+    it. Credits are cached and refreshed in the background every
+    ``credits_interval`` seconds, with one request for all the accounts. All the
+    accounts share one :class:`RateLimiter` and one :class:`BlockFollower`.
+    """
+
+    def __init__(
+        self,
+        accounts: List[Tuple[str, str]],
+        nodes: Optional[List[str]] = None,
+        dry_run: bool = False,
+        connector: Optional[aiohttp.BaseConnector] = None,
+        credits_interval: float = 60.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        rebroadcast: bool = False,
+        min_credits: float = 5.0,
+    ):
+        if not accounts:
+            raise PodpingValidationError("At least one account is required")
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.block_follower = BlockFollower(nodes, connector)
+        self.writers = [
+            PodpingWriter(
+                account,
+                posting_key,
+                nodes,
+                dry_run,
+                connector,
+                rate_limiter=self.rate_limiter,
+                block_follower=self.block_follower,
+                rebroadcast=rebroadcast,
+            )
+            for account, posting_key in accounts
+        ]
+        self.credits_interval = credits_interval
+        self.min_credits = min_credits
+        self._credits: Dict[str, float] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "PodpingWriterPool":
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        await asyncio.gather(*(w.close() for w in self.writers))
+        await self.block_follower.close()
+
+    async def _refresh_credits(self) -> None:
+        stale = [w for w in self.writers if w._hive_writer.rc.needs_sync()]
+        if stale:
+            try:
+                rc_accounts = await stale[0]._hive_writer.find_rc_accounts(
+                    [w.account for w in stale]
+                )
+                for writer in stale:
+                    if writer.account in rc_accounts:
+                        writer._hive_writer.rc.sync(rc_accounts[writer.account])
+            except Exception as e:
+                logger.debug(f"Failed to get RC: {e}")
+        self._credits = {
+            w.account: w._hive_writer.rc.percentage() for w in self.writers
+        }
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.credits_interval)
+            try:
+                await self._refresh_credits()
+            except Exception as e:
+                logger.debug(f"Failed to refresh Resource Credits: {e}")
+
+    def _choose(self, ops: int) -> PodpingWriter:
+        """The writer that can send ``ops`` soonest, preferring the most Resource Credits."""
+        funded = [
+            w
+            for w in self.writers
+            if self._credits.get(w.account, 0.0) >= self.min_credits
+        ]
+        return min(
+            funded or self.writers,
+            key=lambda w: (
+                self.rate_limiter.delay(w.account, ops),
+                -self._credits.get(w.account, 0.0),
+            ),
+        )
+
+    @property
+    def queue_delay(self) -> float:
+        """Seconds a new post would currently wait for the least busy account."""
+        return min(self.rate_limiter.delay(w.account) for w in self.writers)
+
+    async def get_credits(self) -> Dict[str, float]:
+        """Return the cached Resource Credits percentage of each account."""
+        if not self._credits:
+            await self._refresh_credits()
+        return dict(self._credits)
+
+    async def post(
+        self,
+        urls: Union[str, List[str]],
+        reason: str = "update",
+        medium: str = "podcast",
+    ) -> dict:
+        """Post update notification for one or more feed URLs. Returns ``{"tx_id", "account"}``."""
+        url_list = [urls] if isinstance(urls, str) else list(urls)
+        if len(_pack_urls(url_list, medium, reason, _WIDEST_SESSION_ID)) > 1:
+            raise PodpingValidationError("Too many URLs (payload exceeds 8KB limit)")
+        (result,) = await self.post_batch(
+            [(url_list, reason, medium)], return_exceptions=True
+        )
+        if isinstance(result, Exception):
+            raise result
+        return {"tx_id": result["tx_id"], "account": result["account"]}
+
+    async def post_many(
+        self,
+        urls: List[str],
+        reason: str = "update",
+        medium: str = "podcast",
+    ) -> List[dict]:
+        """Post any number of feed URLs, spreading the payloads across accounts."""
+        results = await self.post_batch([(urls, reason, medium)])
+        # Failures were raised, so every result is a dict
+        return [
+            {k: r[k] for k in ("tx_id", "account", "urls")}
+            for r in results
+            if isinstance(r, dict)
+        ]
+
+    async def post_batch(
+        self,
+        notifications: Sequence[Tuple[Union[str, List[str]], str, str]],
+        return_exceptions: bool = False,
+    ) -> List[Union[dict, Exception]]:
+        """Like :meth:`PodpingWriter.post_batch`, with each result naming its ``account``."""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._refresh_loop())
+        if not self._credits:
+            await self._refresh_credits()
+
+        items = []
+        for urls, reason, medium in notifications:
+            url_list = [urls] if isinstance(urls, str) else list(urls)
+            _validate_urls(url_list)
+            for chunk in _pack_urls(url_list, medium, reason, _WIDEST_SESSION_ID):
+                items.append((chunk, reason, medium))
+
+        size = min(self.rate_limiter.ops_per_block, HIVE_CUSTOM_OP_BLOCK_LIMIT)
+        tasks = [
+            asyncio.ensure_future(self._post_chunk(items[i : i + size]))
+            for i in range(0, len(items), size)
+        ]
+
+        results: List[Union[dict, Exception]] = []
+        for chunk_results in await asyncio.gather(*tasks):
+            results.extend(chunk_results)
+        if not return_exceptions:
+            _raise_failures(results)
+        return results
+
+    async def _post_chunk(self, chunk: list) -> List[Union[dict, Exception]]:
+        # The writer reserves its rate limiter slot before its first await, so
+        # the next chunk's choice already sees it
+        writer = self._choose(len(chunk))
+        results = await writer.post_batch(chunk, return_exceptions=True)
+        for result in results:
+            if not isinstance(result, Exception):
+                result["account"] = writer.account
+        return results
@@ -0,0 +1,23 @@
+import pytest
+
+from pypodping.checkpoint import (
+    CheckpointStore,
+    FileCheckpointStore,
+    SQLiteCheckpointStore,
+)
+
+
+def test_checkpoint_store_is_abstract():
+    with pytest.raises(TypeError):
+        CheckpointStore()
+
+
+@pytest.mark.parametrize("store_class", [FileCheckpointStore, SQLiteCheckpointStore])
+def test_save_and_load(tmp_path, store_class):
+    path = tmp_path / "checkpoint"
+    with store_class(path) as store:
+        assert store.load() is None
+        store.save(100)
+        store.save(101)
+    with store_class(path) as store:
+        assert store.load() == 101
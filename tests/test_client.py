@@ -0,0 +1,186 @@
+import asyncio
+
+import pytest
+
+from pypodping import client as client_module
+from pypodping.client import HiveClient
+from pypodping.errors import PodpingConnectionError, PodpingNetworkError
+
+NODES = ["https://a.example", "https://b.example"]
+DUPLICATE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "error": {"code": -32003, "message": "Duplicate transaction check failed"},
+}
+
+
+def make_client(responses):
+    """A client whose nodes answer from ``responses``, in order."""
+    client = HiveClient(NODES)
+    client._session = object()
+    answers = iter(responses)
+
+    async def post(node, payload):
+        answer = next(answers)
+        if isinstance(answer, BaseException):
+            raise answer
+        return answer
+
+    client._post = post
+    return client
+
+
+@pytest.mark.asyncio
+async def test_broadcast_duplicate_after_failure_is_success():
+    client = make_client([asyncio.TimeoutError(), DUPLICATE])
+    node = await client.broadcast_transaction({})
+    assert node in NODES
+
+
+@pytest.mark.asyncio
+async def test_broadcast_duplicate_on_first_attempt_fails():
+    client = make_client([DUPLICATE])
+    with pytest.raises(PodpingNetworkError):
+        await client.broadcast_transaction({})
+
+
+@pytest.mark.asyncio
+async def test_duplicate_nodes_are_tried_once():
+    client = HiveClient(NODES + NODES[:1])
+    assert client.nodes == NODES
+
+    client._session = object()
+    tried = []
+
+    async def post(node, payload):
+        tried.append(node)
+        raise asyncio.TimeoutError()
+
+    client._post = post
+    with pytest.raises(PodpingConnectionError):
+        await client.rpc_call("condenser_api.get_config")
+    assert sorted(tried) == sorted(NODES)
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_cancels_primary_when_cancelled():
+    client = HiveClient(NODES)
+    client._session = object()
+    started = asyncio.Event()
+    cancelled = []
+
+    async def post(node, payload):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(node)
+            raise
+
+    client._post = post
+    request = asyncio.ensure_future(
+        client._send_hedged(client._request("condenser_api.get_config"), 5.0)
+    )
+    await started.wait()
+    request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await request
+    await asyncio.sleep(0)
+    assert len(cancelled) == 1
+
+
+@pytest.mark.asyncio
+async def test_short_lived_client_sends_one_request():
+    client = HiveClient(["https://c.example", "https://d.example"])
+    calls = []
+
+    async def post(node, payload):
+        calls.append(payload["method"])
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": {}}
+
+    client._post = post
+    async with client:
+        await client.rpc_call("condenser_api.get_config")
+        await asyncio.sleep(0)
+    assert calls == ["condenser_api.get_config"]
+
+
+@pytest.mark.asyncio
+async def test_clients_share_node_health_and_probes():
+    nodes = ["https://e.example", "https://f.example"]
+    first, second = HiveClient(nodes), HiveClient(nodes)
+    assert first.pool is second.pool
+
+    await first.__aenter__()
+    await second.__aenter__()
+    prober = client_module._probers[first.pool]
+    assert prober.owner is first
+
+    # The probes move to a client that is still open
+    await first.__aexit__(None, None, None)
+    assert prober.owner is second
+    await second.__aexit__(None, None, None)
+    assert prober.owner is None and prober.task is None
+
+
+@pytest.mark.asyncio
+async def test_following_client_checks_heads_on_open():
+    nodes = ["https://g.example", "https://h.example"]
+    client = HiveClient(nodes, head_checks=True)
+    heads = {nodes[0]: 1000, nodes[1]: 980}
+
+    async def post(node, payload):
+        client.pool.record_success(node, 0.1, heads[node])
+        return {"result": {"head_block_number": heads[node]}}
+
+    client._post = post
+    async with client:
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert client.pool.stats[nodes[1]].quarantined
+        assert not client.pool.stats[nodes[0]].quarantined
+
+
+@pytest.mark.asyncio
+async def test_block_at_head_is_retried_without_quarantine(monkeypatch):
+    monkeypatch.setattr(client_module, "NEAR_HEAD_RETRY_DELAY", 0)
+    client = make_client(
+        [{"id": 1, "result": None}, {"id": 1, "result": {"block_id": "64"}}]
+    )
+    for node in NODES:
+        client.pool.record_success(node, 0.1, head_block=100)
+
+    assert await client.get_block(100, required=True) == {"block_id": "64"}
+    assert not any(stats.quarantined for stats in client.pool.stats.values())
+
+
+@pytest.mark.asyncio
+async def test_missing_old_block_quarantines_node():
+    client = make_client(
+        [{"id": 1, "result": None}, {"id": 1, "result": {"block_id": "5a"}}]
+    )
+    for node in NODES:
+        client.pool.record_success(node, 0.1, head_block=100)
+
+    assert await client.get_block(90, required=True) == {"block_id": "5a"}
+    assert sum(stats.quarantined for stats in client.pool.stats.values()) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_results_follow_call_order_and_isolate_errors():
+    client = make_client([])
+
+    async def post(node, payload):
+        answers = [{"id": r["id"], "result": r["params"][0]} for r in payload]
+        answers[1] = {"id": payload[1]["id"], "error": {"code": -1, "message": "bad"}}
+        return answers[::-1]
+
+    client._post = post
+    calls = [("condenser_api.get_block", [n]) for n in (7, 8, 9)]
+
+    with pytest.raises(PodpingNetworkError):
+        await client.rpc_batch(calls)
+
+    seven, failed, nine = await client.rpc_batch(calls, return_exceptions=True)
+    assert (seven, nine) == (7, 9)
+    assert isinstance(failed, PodpingNetworkError)
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pypodping.confirm import BlockFollower
+
+GENESIS = datetime(2026, 1, 1)
+
+
+def block_time(block_num: int) -> datetime:
+    return GENESIS + timedelta(seconds=3 * block_num)
+
+
+def expiration(block_num: int) -> datetime:
+    return block_time(block_num).replace(tzinfo=timezone.utc)
+
+
+class StubClient:
+    """A chain at ``head``, grown by :meth:`add_block`."""
+
+    def __init__(self, head, transactions=None):
+        self.head = head
+        self.transactions = transactions or {}
+        self.fetched = []
+
+    def add_block(self, tx_ids):
+        self.head += 1
+        self.transactions[self.head] = tx_ids
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        pass
+
+    async def get_dynamic_global_properties(self):
+        return {
+            "head_block_number": self.head,
+            "last_irreversible_block_num": self.head - 20,
+            "time": block_time(self.head).isoformat(),
+        }
+
+    async def get_block(self, block_num, required=False):
+        self.fetched.append(block_num)
+        return {
+            "block_id": f"{block_num:08x}",
+            "previous": f"{block_num - 1:08x}",
+            "timestamp": block_time(block_num).isoformat(),
+            "transaction_ids": self.transactions.get(block_num, []),
+        }
+
+
+def make_follower(client):
+    follower = BlockFollower(nodes=["https://node"])
+    follower._client = client
+    follower._scheduler.delay = lambda: 0.01
+    return follower
+
+
+@pytest.mark.asyncio
+async def test_track_searches_from_after_block():
+    client = StubClient(head=110, transactions={105: ["tx1"]})
+    follower = make_follower(client)
+
+    future = follower.track("tx1", expiration(130), after_block=100)
+    result = await asyncio.wait_for(future, 1)
+
+    assert result["block_num"] == 105
+    await follower.close()
+
+
+@pytest.mark.asyncio
+async def test_blocks_are_fetched_once():
+    client = StubClient(head=100)
+    follower = make_follower(client)
+
+    futures = []
+    for i in range(12):
+        client.add_block([f"tx{i}"])
+        # Referencing a block well behind the head, as a cached one would
+        futures.append(
+            follower.track(f"tx{i}", expiration(200), after_block=client.head - 8)
+        )
+        await asyncio.sleep(0.05)
+
+    results = await asyncio.wait_for(asyncio.gather(*futures), 1)
+    assert [r["block_num"] for r in results] == list(range(101, 113))
+    assert len(client.fetched) == len(set(client.fetched))
+    await follower.close()
+
+
+@pytest.mark.asyncio
+async def test_unscanned_blocks_are_backfilled():
+    client = StubClient(head=200, transactions={192: ["old"], 200: ["new"]})
+    follower = make_follower(client)
+
+    new = follower.track("new", expiration(300), after_block=198)
+    await asyncio.wait_for(new, 1)
+    old = follower.track("old", expiration(300), after_block=190)
+    result = await asyncio.wait_for(old, 1)
+
+    assert result["block_num"] == 192
+    assert len(client.fetched) == len(set(client.fetched))
+    await follower.close()
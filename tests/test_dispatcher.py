@@ -0,0 +1,63 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from pypodping.dispatcher import CallbackDispatcher
+from pypodping.types import PodpingData
+
+URLS = [f"https://example.com/{n}.xml" for n in range(20)]
+
+
+def make_data(urls, block_num):
+    return PodpingData(
+        urls=urls,
+        timestamp=datetime.now(timezone.utc),
+        account="podping",
+        block_num=block_num,
+    )
+
+
+@pytest.mark.asyncio
+async def test_updates_for_a_feed_run_one_at_a_time_in_block_order():
+    dispatcher = CallbackDispatcher(workers=4)
+    await dispatcher.start()
+    seen = {url: [] for url in URLS}
+    running = set()
+
+    async def callback(data):
+        for url in data.urls:
+            assert url not in running
+        running.update(data.urls)
+        # Later blocks often finish first if nothing keeps them in order
+        await asyncio.sleep(random.random() / 100)
+        running.difference_update(data.urls)
+        for url in data.urls:
+            seen[url].append(data.block_num)
+
+    for block_num in range(30):
+        await dispatcher.submit(callback, make_data(random.sample(URLS, 5), block_num))
+    await dispatcher.close()
+
+    for blocks in seen.values():
+        assert blocks == sorted(blocks)
+    assert sum(len(blocks) for blocks in seen.values()) == 30 * 5
+
+
+@pytest.mark.asyncio
+async def test_failing_callback_does_not_stop_the_worker():
+    dispatcher = CallbackDispatcher(workers=1)
+    await dispatcher.start()
+    handled = []
+
+    def callback(data):
+        if data.block_num == 1:
+            raise ValueError("bad feed")
+        handled.append(data.block_num)
+
+    for block_num in range(3):
+        await dispatcher.submit(callback, make_data(URLS[:1], block_num))
+    await dispatcher.close()
+
+    assert handled == [0, 2]
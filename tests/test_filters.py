@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+from pypodping.filters import PodpingFilter, SubscriptionIndex
+from pypodping.types import PodpingData
+
+
+def make_data(urls, medium="podcast", reason="update", account="podping"):
+    return PodpingData(
+        urls=urls,
+        timestamp=datetime.now(timezone.utc),
+        account=account,
+        medium=medium,
+        reason=reason,
+    )
+
+
+def handlers(matches):
+    return [handler for handler, _ in matches]
+
+
+def test_fields_match_with_wildcards():
+    index = SubscriptionIndex()
+    index.add("all")
+    index.add("music", PodpingFilter.create(medium="music"))
+    index.add("live", PodpingFilter.create(reason=["live", "liveEnd"]))
+    index.add("music-live", PodpingFilter.create(medium="music", reason="live"))
+
+    assert handlers(index.match(make_data(["https://a.com/f"]))) == ["all"]
+    assert handlers(index.match(make_data(["https://a.com/f"], reason="live"))) == [
+        "all",
+        "live",
+    ]
+    music_live = make_data(["https://a.com/f"], medium="music", reason="live")
+    assert handlers(index.match(music_live)) == ["all", "music", "live", "music-live"]
+
+
+def test_url_filters_only_deliver_accepted_urls():
+    index = SubscriptionIndex()
+    index.add("hosts", PodpingFilter.create(hosts="Feeds.Example.com"))
+    index.add("prefix", PodpingFilter.create(url_prefixes="https://a.com/shows/"))
+    index.add("nested", PodpingFilter.create(url_prefixes=["https://a.com/"]))
+    urls = [
+        "https://feeds.example.com/1.xml",
+        "https://a.com/shows/2.xml",
+        "https://a.com/other.xml",
+        "https://b.com/3.xml",
+    ]
+
+    matches = dict(index.match(make_data(urls)))
+
+    assert matches["hosts"].urls == urls[:1]
+    assert matches["prefix"].urls == urls[1:2]
+    assert matches["nested"].urls == urls[1:3]
+
+
+def test_unfiltered_subscribers_get_the_original_data():
+    index = SubscriptionIndex()
+    index.add("any")
+    index.add("hosts", PodpingFilter.create(hosts="a.com"))
+    data = make_data(["https://a.com/1.xml"])
+
+    matches = index.match(data)
+
+    assert all(matched is data for _, matched in matches)
+    assert handlers(matches) == ["any", "hosts"]
+    assert handlers(index.match(make_data(["https://b.com/1.xml"]))) == ["any"]
+
+
+def test_removing_a_subscriber_recompiles():
+    index = SubscriptionIndex()
+    index.add("a", PodpingFilter.create(accounts="alice"))
+    index.add("b", PodpingFilter.create(accounts="bob"))
+    data = make_data(["https://a.com/1.xml"], account="bob")
+    assert handlers(index.match(data)) == ["b"]
+
+    index.remove("b")
+    assert len(index) == 1
+    assert index.match(data) == []
@@ -0,0 +1,42 @@
+import time
+
+from pypodping.nodes import NodePool
+
+NODES = ["https://a.example", "https://b.example"]
+
+
+def test_heads_reported_at_different_times_are_not_lag():
+    pool = NodePool(NODES, block_interval=3.0)
+    pool.record_success(NODES[0], 0.1, head_block=100)
+    pool.record_success(NODES[1], 0.1, head_block=100)
+
+    # Only the first node reports again, 30 s (10 blocks) later
+    pool.stats[NODES[1]].head_at -= 30.0
+    pool.stats[NODES[0]].head_at -= 30.0
+    pool.record_success(NODES[0], 0.1, head_block=110)
+
+    assert pool.lag(NODES[1]) == 0
+    assert pool.head_block == 110
+
+
+def test_slow_node_loses_to_fast_node_after_head_updates():
+    pool = NodePool(NODES, block_interval=3.0)
+    pool.record_success(NODES[0], 0.1, head_block=100)
+    pool.record_success(NODES[1], 0.1, head_block=100)
+    pool.stats[NODES[1]].head_at -= 30.0
+    pool.stats[NODES[0]].head_at -= 30.0
+    for _ in range(20):
+        pool.record_success(NODES[0], 2.0, head_block=110)
+
+    assert pool.best() == NODES[1]
+
+
+def test_node_behind_is_lagging():
+    pool = NodePool(NODES, block_interval=3.0, max_lag=10)
+    now = time.monotonic()
+    pool.record_success(NODES[0], 0.1, head_block=120)
+    pool.record_success(NODES[1], 0.1, head_block=100)
+    pool.stats[NODES[1]].head_at = now
+
+    assert pool.lag(NODES[1]) == 20
+    assert pool.stats[NODES[1]].quarantined
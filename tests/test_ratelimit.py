@@ -0,0 +1,45 @@
+import pytest
+
+from pypodping.ratelimit import RateLimiter, TokenBucket
+
+
+def test_bucket_serves_reservations_in_order():
+    bucket = TokenBucket(rate=1.0, capacity=2.0)
+    now = 100.0
+    bucket._updated = now
+
+    assert bucket.reserve(1, now) == 0.0
+    assert bucket.reserve(1, now) == 0.0
+    # The balance goes negative, so each later caller waits behind the others
+    assert bucket.reserve(1, now) == pytest.approx(1.0)
+    assert bucket.reserve(2, now) == pytest.approx(3.0)
+    assert bucket.wait_time(1, now + 4.0) == pytest.approx(0.0)
+
+
+def test_bucket_refills_up_to_capacity():
+    bucket = TokenBucket(rate=2.0, capacity=4.0)
+    bucket._updated = 0.0
+    bucket.reserve(4, 0.0)
+
+    assert bucket.wait_time(3, 1.0) == pytest.approx(0.5)
+    assert bucket.wait_time(0, 60.0) == 0.0
+    assert bucket.tokens == 4.0
+
+
+def test_limiter_paces_each_account_separately():
+    limiter = RateLimiter(ops_per_block=5, block_interval=3.0)
+
+    assert limiter.reserve("a", 5) == 0.0
+    assert limiter.reserve("a", 5) == pytest.approx(3.0, abs=0.01)
+    assert limiter.reserve("b", 5) == 0.0
+    assert limiter.delay("a") == pytest.approx(3.6, abs=0.01)
+    assert limiter.delay("b", ops=5) == pytest.approx(3.0, abs=0.01)
+
+
+def test_byte_cap_is_shared_between_accounts():
+    limiter = RateLimiter(ops_per_block=5, bytes_per_second=1000)
+
+    assert limiter.reserve("a", 1, size=1000) == 0.0
+    assert limiter.reserve("b", 1, size=500) == pytest.approx(0.5, abs=0.01)
+    assert limiter.delay() == pytest.approx(0.5, abs=0.01)
+    assert limiter.delay("c") == pytest.approx(0.5, abs=0.01)
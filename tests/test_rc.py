@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from pypodping.rc import RC_REGENERATION_SECONDS, RCEstimator
+
+MAX_RC = 10**12
+
+
+def rc_account(mana, updated_at=None):
+    return {
+        "max_rc": str(MAX_RC),
+        "rc_manabar": {
+            "current_mana": str(int(mana)),
+            "last_update_time": time.time() if updated_at is None else updated_at,
+        },
+    }
+
+
+def test_sync_learns_cost_per_byte_from_the_chain():
+    rc = RCEstimator(cost_per_byte=1_000_000.0, alpha=0.5)
+    rc.sync(rc_account(MAX_RC / 2))
+    rc.charge(1000)
+    assert rc.mana() == pytest.approx(MAX_RC / 2 - 1000 * 1_000_000, rel=1e-6)
+
+    # The chain charged 3,000,000 per byte, not 1,000,000
+    rc.sync(rc_account(MAX_RC / 2 - 1000 * 3_000_000))
+
+    assert rc.cost_per_byte == pytest.approx(2_000_000, rel=0.01)
+    assert rc.mana() == pytest.approx(MAX_RC / 2 - 1000 * 3_000_000, rel=1e-6)
+
+
+def test_sync_without_charges_keeps_cost():
+    rc = RCEstimator(cost_per_byte=1_000_000.0)
+    rc.sync(rc_account(MAX_RC / 2))
+    rc.sync(rc_account(MAX_RC / 4))
+    assert rc.cost_per_byte == 1_000_000.0
+    assert rc.percentage() == pytest.approx(25.0, rel=1e-4)
+
+
+def test_mana_regenerates_linearly_and_caps():
+    rc = RCEstimator()
+    rc.sync(rc_account(0, time.time() - RC_REGENERATION_SECONDS / 2))
+    assert rc.percentage() == pytest.approx(50.0, rel=1e-3)
+
+    rc.sync(rc_account(MAX_RC / 2, time.time() - RC_REGENERATION_SECONDS))
+    assert rc.percentage() == 100.0
+
+
+def test_resync_is_due_when_stale_or_invalidated():
+    rc = RCEstimator(resync_interval=300.0)
+    assert rc.needs_sync()
+    rc.charge(1000)
+    assert rc.mana() == 0.0
+
+    rc.sync(rc_account(MAX_RC))
+    assert not rc.needs_sync()
+    rc.invalidate()
+    assert rc.needs_sync()
@@ -0,0 +1,80 @@
+import pytest
+
+from pypodping import scheduler as scheduler_module
+from pypodping.scheduler import BlockScheduler
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(scheduler_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_first_head_sets_offset(clock):
+    scheduler = BlockScheduler(margin=0.1)
+    assert scheduler.next_block_at() is None
+    assert scheduler.delay() == scheduler.block_interval
+
+    assert scheduler.observe(100, clock[0] - 0.5)
+    assert scheduler.next_block_at() == pytest.approx(clock[0] - 0.5 + 3.0 + 0.5 + 0.1)
+    assert not scheduler.observe(100, clock[0])
+
+
+def test_blocks_found_first_try_move_polls_earlier(clock):
+    scheduler = BlockScheduler()
+    scheduler.observe(100, clock[0] - 0.5)
+
+    offsets = []
+    for block_num in range(101, 105):
+        clock[0] += 3.0
+        scheduler.observe(block_num, clock[0] - 0.5)
+        offsets.append(scheduler._offset)
+
+    # The step doubles while polls keep finding blocks: 0.05, 0.1, 0.2, 0.4
+    assert offsets == pytest.approx([0.45, 0.35, 0.15, -0.25])
+
+
+def test_miss_moves_polls_back_and_resets_step(clock):
+    scheduler = BlockScheduler(retry_delay=0.25)
+    scheduler.observe(100, clock[0] - 0.5)
+    clock[0] += 3.0
+    scheduler.observe(101, clock[0] - 0.5)
+    assert scheduler._offset == pytest.approx(0.45)
+
+    clock[0] += 3.0
+    scheduler.miss()
+    scheduler.observe(102, clock[0] - 2.0)
+    assert scheduler._offset == pytest.approx(0.7)
+    assert scheduler._step == 0.05
+    assert scheduler.misses == 0
+
+
+def test_empty_polls_back_off_up_to_a_block(clock):
+    scheduler = BlockScheduler(retry_delay=0.25, margin=0.0)
+    scheduler.observe(100, clock[0])
+    assert scheduler.delay() == pytest.approx(3.0)
+
+    clock[0] += 3.0
+    assert scheduler.delay() == 0.0
+    delays = []
+    for _ in range(6):
+        scheduler.miss()
+        delays.append(scheduler.delay())
+    assert delays == [0.25, 0.5, 1.0, 2.0, 3.0, 3.0]
+
+
+def test_probes_only_while_keeping_up(clock):
+    scheduler = BlockScheduler(max_misses=2)
+    scheduler.observe(100, clock[0])
+    clock[0] += 3.2
+    assert scheduler.should_probe(101)
+    assert not scheduler.should_probe(102)
+
+    scheduler.miss()
+    scheduler.miss()
+    assert not scheduler.should_probe(101)
+
+    scheduler.observe(101, clock[0])
+    clock[0] += 10.0
+    assert not scheduler.should_probe(102)
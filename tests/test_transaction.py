@@ -0,0 +1,74 @@
+import hashlib
+from datetime import datetime, timezone
+
+import ecdsa
+from lighthive.datastructures import Operation
+
+from pypodping.transaction import (
+    HIVE_CHAIN_ID,
+    decode_private_key,
+    serialize_transaction,
+    sign_transaction,
+    transaction_id,
+)
+
+WIF = "5HpjKrb7dH5kKQQzmbjB87Mxova7mek5bXUTWfndcX6tBoqUwzm"
+SECRET = bytes(range(1, 33))
+
+OPERATION = Operation(
+    "custom_json",
+    {
+        "required_auths": [],
+        "required_posting_auths": ["podping"],
+        "id": "pp_podcast_update",
+        "json": '{"v":"1.0"}',
+    },
+)
+EXPIRATION = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+TX_HEX = (
+    "3412"  # ref_block_num
+    "efbeadde"  # ref_block_prefix
+    "00b95569"  # expiration, 2026-01-01T00:00:00
+    "01"  # one operation
+    "12"  # custom_json
+    "00"  # required_auths
+    "0107706f6470696e67"  # required_posting_auths: ["podping"]
+    "1170705f706f64636173745f757064617465"  # id: "pp_podcast_update"
+    "0b7b2276223a22312e30227d"  # json: '{"v":"1.0"}'
+    "00"  # extensions
+)
+SIGNATURE = (
+    "1f280eeef50a46f2dc94395743f4aad267ff3d36d7a7838c6a5fcba07638fdb8f0"
+    "1d5a688b6e2e6c631ba505900f6e83e5692c22d2791329365c8789dfcee1422e"
+)
+
+
+def test_decode_private_key():
+    assert decode_private_key(WIF) == SECRET
+
+
+def test_serialize_transaction():
+    tx_bytes = serialize_transaction(0x1234, 0xDEADBEEF, EXPIRATION, [OPERATION])
+    assert tx_bytes.hex() == TX_HEX
+    assert transaction_id(tx_bytes) == "deff21e7a9979af9fa6fba61dace5480937a7e35"
+
+
+def test_sign_transaction():
+    tx_bytes = bytes.fromhex(TX_HEX)
+    # Deterministic (RFC 6979), so the same transaction always signs the same
+    assert sign_transaction(tx_bytes, SECRET) == SIGNATURE
+    signature = bytes.fromhex(SIGNATURE)
+
+    order = ecdsa.SECP256k1.order
+    s = int.from_bytes(signature[33:], "big")
+    assert s <= order // 2
+
+    recovery_id = signature[0] - 27 - 4
+    assert 0 <= recovery_id < 4
+    digest = hashlib.sha256(bytes.fromhex(HIVE_CHAIN_ID) + tx_bytes).digest()
+    keys = ecdsa.VerifyingKey.from_public_key_recovery_with_digest(
+        signature[1:], digest, ecdsa.SECP256k1, sigdecode=ecdsa.util.sigdecode_string
+    )
+    expected = ecdsa.SigningKey.from_string(SECRET, curve=ecdsa.SECP256k1).verifying_key
+    assert keys[recovery_id].to_string() == expected.to_string()
@@ -0,0 +1,22 @@
+from pypodping.urlset import UrlSet, normalize_url
+
+
+def test_normalize_url():
+    assert (
+        normalize_url(" HTTPS://Example.COM:443/feed/ ") == "https://example.com/feed"
+    )
+    assert (
+        normalize_url("https://example.com/%7efeed%2f")
+        == "https://example.com/~feed%2F"
+    )
+
+
+def test_iri_matches_percent_encoded_uri():
+    iri = "https://example.com/é?name=ü"
+    uri = "https://example.com/%c3%a9?name=%C3%BC"
+    assert (
+        normalize_url(iri)
+        == normalize_url(uri)
+        == ("https://example.com/%C3%A9?name=%C3%BC")
+    )
+    assert uri in UrlSet([iri])
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pypodping import CheckpointStore, PodpingWatcher
+from pypodping import watcher as watcher_module
+from pypodping.types import PodpingData
+
+GENESIS = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_block(block_num, urls=()):
+    timestamp = GENESIS + timedelta(seconds=3 * block_num)
+    operations = [
+        [
+            "custom_json",
+            {
+                "id": "pp_podcast_update",
+                "required_posting_auths": ["podping"],
+                "json": json.dumps({"version": "1.1", "iris": [url]}),
+            },
+        ]
+        for url in urls
+    ]
+    return {
+        "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S"),
+        "transactions": [{"operations": operations}] if operations else [],
+        "transaction_ids": [f"{block_num:040x}"] if operations else [],
+    }
+
+
+def make_data(block_num):
+    return PodpingData(
+        urls=[f"https://a.com/{block_num}"],
+        timestamp=GENESIS,
+        account="podping",
+        block_num=block_num,
+    )
+
+
+class StubClient:
+    """Serves blocks 1..head, answering calls in random order."""
+
+    def __init__(self, head, updates=None):
+        self.head = head
+        self.updates = updates or {}
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _answer(self, call, blocks):
+        self.calls.append(call)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(random.random() / 200)
+        self.in_flight -= 1
+        return blocks
+
+    def _block(self, block_num):
+        if block_num > self.head:
+            return None
+        return make_block(block_num, self.updates.get(block_num, ()))
+
+    async def get_block(self, block_num, required=False):
+        (block,) = await self._answer(
+            ("get_block", block_num), [self._block(block_num)]
+        )
+        return block
+
+    async def get_blocks(self, block_nums):
+        block_nums = list(block_nums)
+        blocks = [self._block(n) for n in block_nums]
+        return await self._answer(
+            ("get_blocks", block_nums[0], len(block_nums)), blocks
+        )
+
+    async def get_block_range(self, start, count):
+        blocks = [self._block(n) for n in range(start, start + count)]
+        return await self._answer(("get_block_range", start, count), blocks)
+
+    async def get_block_header(self, block_num):
+        self.calls.append(("get_block_header", block_num))
+        return make_block(block_num)
+
+    async def get_dynamic_global_properties(self):
+        return {
+            "head_block_number": self.head,
+            "time": make_block(self.head)["timestamp"],
+        }
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        pass
+
+
+async def fetch_all(watcher, client, start, end):
+    watcher.running = True
+    return [num async for num, _ in watcher._fetch_blocks(client, start, end)]
+
+
+@pytest.mark.asyncio
+async def test_catch_up_fetches_batches_concurrently_in_order():
+    watcher = PodpingWatcher(fetch_window=4, batch_size=10, range_threshold=1000)
+    client = StubClient(head=200)
+
+    assert await fetch_all(watcher, client, 1, 95) == list(range(1, 96))
+    assert [call[0] for call in client.calls] == ["get_blocks"] * 10
+    assert 1 < client.max_in_flight <= 4
+
+
+@pytest.mark.asyncio
+async def test_long_gaps_use_block_ranges_then_batches():
+    watcher = PodpingWatcher(
+        batch_size=10, range_threshold=50, range_size=100, fetch_window=2
+    )
+    client = StubClient(head=1000)
+
+    assert await fetch_all(watcher, client, 1, 245) == list(range(1, 246))
+    assert sorted(call for call in client.calls) == [
+        ("get_block_range", 1, 100),
+        ("get_block_range", 101, 100),
+        ("get_blocks", 201, 10),
+        ("get_blocks", 211, 10),
+        ("get_blocks", 221, 10),
+        ("get_blocks", 231, 10),
+        ("get_blocks", 241, 5),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_blocks_missing_from_a_range_are_fetched_again():
+    watcher = PodpingWatcher(range_threshold=0, range_size=10)
+    client = StubClient(head=100)
+    get_block_range = client.get_block_range
+
+    async def short_range(start, count):
+        blocks = await get_block_range(start, count)
+        return blocks[:-2] + [None, None]
+
+    client.get_block_range = short_range
+    watcher.running = True
+    blocks = [b async for _, b in watcher._fetch_blocks(client, 1, 10)]
+
+    assert None not in blocks
+    assert ("get_block", 9) in client.calls and ("get_block", 10) in client.calls
+
+
+@pytest.mark.asyncio
+async def test_from_time_finds_the_first_block_at_or_after_it():
+    watcher = PodpingWatcher()
+    client = StubClient(head=100000)
+    when = GENESIS + timedelta(seconds=3 * 4321 - 1)
+
+    assert await watcher._find_block_at(client, when, client.head) == 4321
+    assert await watcher._find_block_at(client, GENESIS, client.head) == 1
+    assert len(client.calls) <= 2 * 17
+
+
+@pytest.mark.asyncio
+async def test_replay_delivers_updates_between_blocks(monkeypatch):
+    client = StubClient(
+        head=500,
+        updates={
+            9: ["https://a.com/early"],
+            10: ["https://a.com/1"],
+            30: ["https://a.com/2"],
+            31: ["https://a.com/late"],
+        },
+    )
+    monkeypatch.setattr(watcher_module, "HiveClient", lambda *args, **kwargs: client)
+    watcher = PodpingWatcher()
+    received = []
+
+    @watcher.on_update
+    def handle(data):
+        received.append((data.block_num, data.urls))
+
+    await asyncio.wait_for(watcher.start(from_block=10, until_block=30), 5)
+
+    assert received == [(10, ["https://a.com/1"]), (30, ["https://a.com/2"])]
+    assert not watcher.running
+
+
+class MemoryCheckpoint(CheckpointStore):
+    def __init__(self):
+        self.saved = None
+
+    def load(self):
+        return self.saved
+
+    def save(self, block_num):
+        self.saved = block_num
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_waits_for_blocking_stream_consumers():
+    watcher = PodpingWatcher(checkpoint=MemoryCheckpoint())
+    updates = watcher.stream()
+    lossy = watcher.stream(overflow="drop_oldest")
+    first = asyncio.ensure_future(updates.__anext__())
+    asyncio.ensure_future(lossy.__anext__())
+    await asyncio.sleep(0)
+
+    for stream in watcher._streams:
+        await stream.put(make_data(1))
+        await stream.put(make_data(2))
+    await first
+    watcher._last_processed = 2
+    watcher._unsaved_blocks = 2
+    save = asyncio.ensure_future(watcher._save_checkpoint())
+    await asyncio.sleep(0.01)
+    assert watcher.checkpoint.saved is None
+
+    await updates.__anext__()
+    await asyncio.sleep(0.01)
+    assert watcher.checkpoint.saved is None
+
+    next_update = asyncio.ensure_future(updates.__anext__())
+    await asyncio.wait_for(save, 1)
+    assert watcher.checkpoint.saved == 2
+    next_update.cancel()
@@ -0,0 +1,289 @@
+import asyncio
+import itertools
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from lighthive.datastructures import Operation
+
+from pypodping import PodpingWriter, PodpingWriterPool
+from pypodping.errors import PodpingBatchError, PodpingError
+from pypodping.ratelimit import RateLimiter
+from pypodping.transaction import (
+    HIVE_MAX_TRANSACTION_SIZE,
+    SIGNATURE_SIZE,
+    serialize_transaction,
+)
+from pypodping.writer import MAX_PAYLOAD_SIZE, _pack_operations, _pack_urls
+
+POSTING_KEY = "5HpjKrb7dH5kKQQzmbjB87Mxova7mek5bXUTWfndcX6tBoqUwzm"
+URL = "https://example.com/feed.xml"
+
+
+class StubFollower:
+    def __init__(self):
+        self.tracked = {}
+
+    def track(self, tx_id, expiration, irreversible=False, after_block=None):
+        future = asyncio.get_running_loop().create_future()
+        self.tracked[tx_id] = future
+        return future
+
+    async def close(self):
+        pass
+
+
+def make_writer():
+    follower = StubFollower()
+    writer = PodpingWriter(
+        "podping", POSTING_KEY, block_follower=follower, rebroadcast=True
+    )
+    tx_ids = (f"tx{n}" for n in itertools.count(1))
+    broadcasts = []
+
+    async def broadcast_operations(operations, avoid=()):
+        broadcasts.append(operations)
+        return {
+            "id": next(tx_ids),
+            "expiration": datetime.now(timezone.utc) + timedelta(seconds=60),
+            "node": "https://node",
+            "ref_block": 100,
+        }
+
+    writer._hive_writer.broadcast_operations = broadcast_operations
+    return writer, follower, broadcasts
+
+
+@pytest.mark.asyncio
+async def test_expired_post_follows_later_post_that_settled_first():
+    writer, follower, broadcasts = make_writer()
+    first = await writer.post(URL, confirm=True)
+    second = await writer.post(URL, confirm=True)
+
+    confirmation = {"tx_id": "tx2", "block_num": 10, "latency": 1.0}
+    follower.tracked["tx2"].set_result(confirmation)
+    await asyncio.sleep(0)
+    follower.tracked["tx1"].set_exception(PodpingError("expired"))
+
+    assert await asyncio.wait_for(first, 1) == confirmation
+    assert await second == confirmation
+    assert len(broadcasts) == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_post_follows_later_pending_post():
+    writer, follower, broadcasts = make_writer()
+    first = await writer.post(URL, confirm=True)
+    second = await writer.post(URL, confirm=True)
+
+    follower.tracked["tx1"].set_exception(PodpingError("expired"))
+    await asyncio.sleep(0)
+    assert not first.done()
+
+    confirmation = {"tx_id": "tx2", "block_num": 10, "latency": 1.0}
+    follower.tracked["tx2"].set_result(confirmation)
+    assert await asyncio.wait_for(first, 1) == confirmation
+    assert await second == confirmation
+    assert len(broadcasts) == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_post_is_rebroadcast():
+    writer, follower, broadcasts = make_writer()
+    outcome = await writer.post(URL, confirm=True)
+
+    follower.tracked["tx1"].set_exception(PodpingError("expired"))
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert "tx2" in follower.tracked
+
+    confirmation = {"tx_id": "tx2", "block_num": 10, "latency": 1.0}
+    follower.tracked["tx2"].set_result(confirmation)
+    assert await asyncio.wait_for(outcome, 1) == confirmation
+    assert len(broadcasts) == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_post_waits_for_every_later_post():
+    writer, follower, broadcasts = make_writer()
+    writer.max_rebroadcasts = 0
+    other = "https://example.com/other.xml"
+    first = await writer.post([URL, other], confirm=True)
+    await writer.post(URL, confirm=True)
+    await writer.post(other, confirm=True)
+
+    follower.tracked["tx1"].set_exception(PodpingError("expired"))
+    confirmation = {"tx_id": "tx3", "block_num": 10, "latency": 1.0}
+    follower.tracked["tx3"].set_result(confirmation)
+    await asyncio.sleep(0)
+    assert not first.done()
+
+    follower.tracked["tx2"].set_exception(PodpingError("expired"))
+    with pytest.raises(PodpingError):
+        await asyncio.wait_for(first, 1)
+    assert len(broadcasts) == 3
+
+
+@pytest.mark.asyncio
+async def test_enqueued_full_payloads_share_transactions():
+    writer, _, broadcasts = make_writer()
+    writer.flush_interval = 60
+    writer.rate_limiter = RateLimiter(ops_per_block=100)
+    urls = [f"https://example.com/{'x' * 200}/{n}.xml" for n in range(300)]
+
+    futures = [writer.enqueue(url) for url in urls]
+    duplicate = writer.enqueue(urls[-1])
+    await writer.flush()
+    await writer.close()
+
+    assert [len(operations) for operations in broadcasts] == [5, 4]
+    assert duplicate.result() == futures[-1].result()
+
+
+@pytest.mark.asyncio
+async def test_failed_transaction_keeps_the_others_results():
+    writer, _, broadcasts = make_writer()
+    writer.rebroadcast = False
+    writer.rate_limiter = RateLimiter(ops_per_block=100)
+    send = writer._hive_writer.broadcast_operations
+
+    async def broadcast_operations(operations, avoid=()):
+        if len(broadcasts) == 1:
+            broadcasts.append(operations)
+            raise ConnectionError("node went away")
+        return await send(operations, avoid)
+
+    writer._hive_writer.broadcast_operations = broadcast_operations
+    notifications = [
+        ([f"https://example.com/{n}.xml"], "update", "podcast") for n in range(12)
+    ]
+
+    with pytest.raises(PodpingBatchError) as caught:
+        await writer.post_batch(notifications)
+
+    results = caught.value.results
+    assert len(broadcasts) == 3
+    assert [isinstance(result, Exception) for result in results] == (
+        [False] * 5 + [True] * 5 + [False] * 2
+    )
+    assert results[0]["tx_id"] == "tx1" and results[10]["tx_id"] == "tx2"
+
+
+def rc_account(account, percent):
+    return {
+        "account": account,
+        "max_rc": "1000000",
+        "rc_manabar": {
+            "current_mana": str(percent * 10000),
+            "last_update_time": int(time.time()),
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_pool_fetches_credits_at_once_and_skips_drained_accounts():
+    pool = PodpingWriterPool([("a", POSTING_KEY), ("b", POSTING_KEY)])
+    calls = []
+
+    async def find_rc_accounts(accounts):
+        calls.append(accounts)
+        return {"a": rc_account("a", 1), "b": rc_account("b", 0)}
+
+    for writer in pool.writers:
+        writer._hive_writer.find_rc_accounts = find_rc_accounts
+
+    credits = await pool.get_credits()
+    assert credits["a"] == pytest.approx(1.0, abs=0.01)
+    assert credits["b"] == pytest.approx(0.0, abs=0.01)
+    assert calls == [["a", "b"]]
+    pool.min_credits = 0.5
+    assert pool._choose(1).account == "a"
+    pool.rate_limiter.reserve("a", 5)
+    assert pool._choose(1).account == "a"
+    await pool.close()
+
+
+def test_packed_urls_fit_the_serialized_payload():
+    writer, _, _ = make_writer()
+    # Non-ASCII characters are escaped in the JSON, so they count six bytes each
+    urls = [f"https://example.com/é{'x' * (n % 90)}/{n}.xml" for n in range(600)]
+    urls += urls[:50]
+
+    chunks = _pack_urls(urls, "podcast", "update", writer.session_id)
+
+    assert sorted(url for chunk in chunks for url in chunk) == sorted(set(urls))
+    sizes = []
+    for chunk in chunks:
+        payload = writer._operation(chunk, "update", "podcast").op_value["json"]
+        assert len(payload) <= MAX_PAYLOAD_SIZE
+        sizes.append(len(payload))
+    # First-fit: a URL only opens or joins a later payload if no earlier one has room
+    for later, chunk in enumerate(chunks):
+        for url in chunk:
+            for size in sizes[:later]:
+                assert size + len(json.dumps(url)) + 1 > MAX_PAYLOAD_SIZE
+
+
+def test_packed_operations_respect_transaction_limits():
+    def custom_json(n, pad):
+        payload = json.dumps({"n": n, "pad": "x" * pad})
+        return Operation(
+            "custom_json",
+            {
+                "required_auths": [],
+                "required_posting_auths": ["podping"],
+                "id": "pp_podcast_update",
+                "json": payload,
+            },
+        )
+
+    big = [custom_json(n, 20000) for n in range(7)]
+    small = [custom_json(n, 100) for n in range(12)]
+
+    big_chunks = _pack_operations(big)
+    small_chunks = _pack_operations(small)
+    assert [len(chunk) for chunk, _ in big_chunks] == [3, 3, 1]
+    assert [len(chunk) for chunk, _ in small_chunks] == [5, 5, 2]
+    assert [op for chunk, _ in big_chunks for op in chunk] == big
+    for chunk, size in big_chunks + small_chunks:
+        tx_bytes = serialize_transaction(0, 0, datetime.now(timezone.utc), chunk)
+        assert len(tx_bytes) + SIGNATURE_SIZE <= size <= HIVE_MAX_TRANSACTION_SIZE
+
+
+@pytest.mark.asyncio
+async def test_enqueue_merges_duplicates_and_groups_by_reason():
+    writer, _, broadcasts = make_writer()
+    writer.flush_interval = 60
+    first = writer.enqueue(URL)
+    again = writer.enqueue(URL)
+    live = writer.enqueue(URL, reason="live")
+
+    await writer.flush()
+    await writer.close()
+
+    assert len(broadcasts) == 1
+    payloads = [json.loads(op.op_value["json"]) for op in broadcasts[0]]
+    assert sorted((p["reason"], p["iris"]) for p in payloads) == [
+        ("live", [URL]),
+        ("update", [URL]),
+    ]
+    assert first.result() == again.result() == live.result() == "tx1"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_futures_fail_with_their_transaction():
+    writer, _, _ = make_writer()
+    writer.flush_interval = 60
+
+    async def broadcast_operations(operations, avoid=()):
+        raise ConnectionError("node went away")
+
+    writer._hive_writer.broadcast_operations = broadcast_operations
+    futures = [writer.enqueue(URL), writer.enqueue(URL)]
+    await writer.flush()
+    await writer.close()
+
+    for future in futures:
+        with pytest.raises(PodpingError):
+            future.result()